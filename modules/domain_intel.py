@@ -4,12 +4,44 @@ Domain Intelligence Module - OSINT
 WHOIS lookup and domain reconnaissance
 """
 
+import os
+import re
+import json
 import socket
+import time
 import dns.resolver
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from .port_scanner import resolve_address
+
+# Only this much of the landing page is read for fingerprinting
+MAX_BODY_BYTES = 64 * 1024
+
+# Technology -> page content keywords, in the order they are reported
+TECH_KEYWORDS = {
+    'WordPress': ('wp-content', 'wordpress'),
+    'Joomla': ('joomla',),
+    'Drupal': ('drupal',),
+    'React': ('react',),
+    'Angular': ('angular',),
+    'Vue.js': ('vue',),
+}
+
+# WHOIS data changes over days, not seconds - keep answers for a day,
+# in memory and on disk so repeat runs don't hit the registrar
+WHOIS_CACHE_TTL = 86400
+WHOIS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.phantom', 'whois')
+_whois_cache = {}
+
+# Geolocation answers per IP: {ip: (geo_info, expires_at)}
+GEO_CACHE_TTL = 300
+_geo_cache = {}
+
 class DomainIntel:
     """
     Domain and website intelligence gathering
@@ -23,10 +55,72 @@ class DomainIntel:
             domain: Target domain (without http://)
         """
         self.domain = domain.replace('http://', '').replace('https://', '').split('/')[0]
+        
+        # One session for every HTTP call so connections are kept alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, read=0, backoff_factor=0.2)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
-    def whois_lookup(self) -> Dict:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the HTTP session"""
+        self.session.close()
+    
+    def whois_lookup(self, refresh: bool = False) -> Dict:
         """
-        Perform WHOIS lookup
+        Perform WHOIS lookup (cached for WHOIS_CACHE_TTL seconds)
+        
+        Args:
+            refresh: Ignore cached answers and query the registrar
+        
+        Returns:
+            WHOIS information
+        """
+        cache_file = os.path.join(WHOIS_CACHE_DIR, re.sub(r'[^a-z0-9.-]', '_', self.domain.lower()) + '.json')
+        
+        if not refresh:
+            cached = _whois_cache.get(self.domain)
+            if cached and cached[1] > time.time():
+                return dict(cached[0])
+            
+            try:
+                with open(cache_file) as f:
+                    entry = json.load(f)
+                if entry['expires_at'] > time.time():
+                    _whois_cache[self.domain] = (entry['info'], entry['expires_at'])
+                    return dict(entry['info'])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        
+        info = self._query_whois()
+        
+        # Only cache real answers - errors should be retried next time
+        if 'error' not in info:
+            expires_at = time.time() + WHOIS_CACHE_TTL
+            _whois_cache[self.domain] = (dict(info), expires_at)
+            
+            try:
+                os.makedirs(WHOIS_CACHE_DIR, exist_ok=True)
+                with open(cache_file, 'w') as f:
+                    json.dump({'expires_at': expires_at, 'info': info}, f, default=str)
+            except OSError:
+                pass
+        
+        return info
+    
+    def _query_whois(self) -> Dict:
+        """
+        Query WHOIS without touching the cache
         
         Returns:
             WHOIS information
@@ -133,17 +227,37 @@ class DomainIntel:
         
         record_types = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME']
         
-        for record_type in record_types:
-            try:
-                answers = dns.resolver.resolve(self.domain, record_type, lifetime=5)
-                records[record_type] = [str(rdata) for rdata in answers]
-            except dns.resolver.NoAnswer:
-                records[record_type] = []
-            except dns.resolver.NXDOMAIN:
-                records['error'] = 'Domain does not exist'
-                break
-            except Exception:
-                records[record_type] = []
+        def query(record_type):
+            answers = dns.resolver.resolve(self.domain, record_type, lifetime=5)
+            return [str(rdata) for rdata in answers]
+        
+        # Each record type is its own round trip - send them all at once
+        executor = ThreadPoolExecutor(max_workers=len(record_types))
+        future_to_type = {
+            executor.submit(query, record_type): record_type
+            for record_type in record_types
+        }
+        
+        try:
+            for future in as_completed(future_to_type):
+                record_type = future_to_type[future]
+                try:
+                    records[record_type] = future.result()
+                except dns.resolver.NoAnswer:
+                    records[record_type] = []
+                except dns.resolver.NXDOMAIN:
+                    # No such domain - the other answers can't exist either
+                    records['error'] = 'Domain does not exist'
+                    break
+                except Exception:
+                    records[record_type] = []
+        finally:
+            # Don't sit waiting on queries still in flight after an NXDOMAIN.
+            # Futures are cancelled one by one - shutdown(cancel_futures=)
+            # needs Python 3.9
+            for future in future_to_type:
+                future.cancel()
+            executor.shutdown(wait=False)
         
         return records
     
@@ -156,13 +270,18 @@ class DomainIntel:
         """
         try:
             # Get IP
-            ip = socket.gethostbyname(self.domain)
+            ip, _ = resolve_address(self.domain)
+            
+            # Reuse a recent geolocation answer for the same IP
+            cached = _geo_cache.get(ip)
+            if cached and cached[1] > time.monotonic():
+                return dict(cached[0])
             
             # Try to get geolocation (using free API)
             geo_info = {'ip': ip}
             
             try:
-                response = requests.get(f'http://ip-api.com/json/{ip}', timeout=5)
+                response = self.session.get(f'http://ip-api.com/json/{ip}', timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     geo_info.update({
@@ -173,6 +292,7 @@ class DomainIntel:
                         'org': data.get('org'),
                         'timezone': data.get('timezone')
                     })
+                    _geo_cache[ip] = (dict(geo_info), time.monotonic() + GEO_CACHE_TTL)
             except:
                 pass
             
@@ -192,7 +312,13 @@ class DomainIntel:
         """
         try:
             url = f"http://{self.domain}"
-            response = requests.get(url, timeout=10, allow_redirects=True)
+            response = self.session.get(url, timeout=10, allow_redirects=True, stream=True)
+            
+            # Fingerprints live near the top of the page - don't pull the rest
+            try:
+                body = response.raw.read(MAX_BODY_BYTES, decode_content=True)
+            finally:
+                response.close()
             
             tech = {
                 'url': response.url,
@@ -203,32 +329,26 @@ class DomainIntel:
             }
             
             # Check for common tech indicators in headers
-            headers = response.headers
-            content = response.text.lower()
+            server = tech['server'].lower()
+            headers = '\n'.join(f'{k}: {v}' for k, v in response.headers.items()).lower()
+            try:
+                content = body.decode(response.encoding or 'utf-8', errors='ignore').lower()
+            except LookupError:
+                content = body.decode('utf-8', errors='ignore').lower()
             
             # Server detection
-            if 'nginx' in tech['server'].lower():
+            if 'nginx' in server:
                 tech['technologies'].append('Nginx')
-            if 'apache' in tech['server'].lower():
+            if 'apache' in server:
                 tech['technologies'].append('Apache')
-            if 'cloudflare' in str(headers).lower():
+            if 'cloudflare' in headers:
                 tech['technologies'].append('Cloudflare')
             
-            # CMS detection
-            if 'wp-content' in content or 'wordpress' in content:
-                tech['technologies'].append('WordPress')
-            if 'joomla' in content:
-                tech['technologies'].append('Joomla')
-            if 'drupal' in content:
-                tech['technologies'].append('Drupal')
-            
-            # Framework detection
-            if 'react' in content:
-                tech['technologies'].append('React')
-            if 'angular' in content:
-                tech['technologies'].append('Angular')
-            if 'vue' in content:
-                tech['technologies'].append('Vue.js')
+            # CMS and framework detection
+            tech['technologies'].extend(
+                name for name, keywords in TECH_KEYWORDS.items()
+                if any(keyword in content for keyword in keywords)
+            )
             
             return tech
             
@@ -239,17 +359,29 @@ class DomainIntel:
         """
         Gather all intelligence on domain
         
+        WHOIS, DNS, geolocation and the HTTP probe are independent
+        network lookups, so they run concurrently and the report takes
+        as long as the slowest one instead of the sum of all four.
+        
         Returns:
             Complete domain intelligence report
         """
-        report = {
-            'domain': self.domain,
-            'timestamp': datetime.now().isoformat(),
-            'whois': self.whois_lookup(),
-            'dns': self.dns_records(),
-            'ip_info': self.get_ip_info(),
-            'web_tech': self.check_web_technologies()
-        }
+        timestamp = datetime.now().isoformat()
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            whois_future = executor.submit(self.whois_lookup)
+            dns_future = executor.submit(self.dns_records)
+            ip_future = executor.submit(self.get_ip_info)
+            web_future = executor.submit(self.check_web_technologies)
+            
+            report = {
+                'domain': self.domain,
+                'timestamp': timestamp,
+                'whois': whois_future.result(),
+                'dns': dns_future.result(),
+                'ip_info': ip_future.result(),
+                'web_tech': web_future.result()
+            }
         
         return report
 
@@ -264,5 +396,5 @@ def domain_intelligence(domain: str) -> Dict:
     Returns:
         Intelligence report
     """
-    intel = DomainIntel(domain)
-    return intel.full_intel()
+    with DomainIntel(domain) as intel:
+        return intel.full_intel()
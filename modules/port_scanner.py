@@ -6,15 +6,21 @@ Purpose: Learn how port scanners work by building one from scratch
 
 This tool demonstrates:
 - TCP socket connections
-- Multi-threaded scanning
+- Non-blocking concurrent scanning
 - Banner grabbing
 - Service detection
 """
 
+import os
 import socket
+import selectors
+import errno
+import struct
 import argparse
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections import deque
 from datetime import datetime
 import json
 
@@ -38,6 +44,62 @@ COMMON_PORTS = {
     8080: "HTTP-Proxy", 8443: "HTTPS-Alt", 27017: "MongoDB"
 }
 
+# Bound once - looked up for every open port
+_common_get = COMMON_PORTS.get
+
+
+def build_result_lines():
+    """Result lines with the colour codes baked in, filled per port"""
+    return (f"{Colors.OKGREEN}[+] Port {{}}/tcp OPEN - {{}}{{}}{Colors.ENDC}",
+            f"{Colors.FAIL}[-] Port {{}}/tcp CLOSED{Colors.ENDC}")
+
+
+OPEN_LINE, CLOSED_LINE = build_result_lines()
+
+
+def blank_colors(colors):
+    """Set every colour code on a Colors-style class to an empty string"""
+    for name in [n for n in vars(colors) if n.isupper()]:
+        setattr(colors, name, '')
+
+
+def disable_colors():
+    """Blank every colour code (piped output, NO_COLOR) and rebuild the result lines"""
+    global OPEN_LINE, CLOSED_LINE
+    
+    blank_colors(Colors)
+    OPEN_LINE, CLOSED_LINE = build_result_lines()
+
+
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    disable_colors()
+
+# connect_ex() results that mean "handshake started, wait for it"
+CONNECT_IN_PROGRESS = {
+    0, errno.EINPROGRESS, errno.EWOULDBLOCK,
+    getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)
+}
+
+# How long to wait for a service to greet us after connecting
+BANNER_TIMEOUT = 2
+
+# Services that wait for the client to talk first - no banner to wait for
+NO_SERVER_GREETING = {80, 443, 8080, 8443}
+
+# SO_LINGER {on, 0s}: close() sends RST instead of leaving the socket in
+# TIME_WAIT, so big scans don't run out of ephemeral ports
+LINGER_RESET = struct.pack('ii', 1, 0)
+
+# Ports poked to decide whether a host is up before a full scan
+ALIVE_PROBE_PORTS = (80, 443, 22)
+
+# Resolved hostnames: {host: ((ip, family), expires_at)}
+# Scans and intel lookups hit the same target over and over in one session,
+# so we only pay for the DNS round trip once every few minutes.
+DNS_CACHE_TTL = 300
+_dns_cache = {}
+_dns_cache_lock = threading.Lock()
+
 
 def print_banner():
     """Print a cool ASCII banner because why not"""
@@ -53,6 +115,65 @@ def print_banner():
     print(banner)
 
 
+def new_scan_socket(family=socket.AF_INET):
+    """
+    Create a TCP socket set up for short-lived scan connections
+    
+    Args:
+        family: Address family (AF_INET or AF_INET6)
+    
+    Returns:
+        socket object
+    """
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+    except OSError:
+        pass  # Not fatal - we just fall back to a normal close
+    
+    return sock
+
+
+def resolve_address(host, ttl=DNS_CACHE_TTL):
+    """
+    Resolve a host to an address and socket family, with a TTL cache
+    
+    IP literals are recognised with AI_NUMERICHOST and never touch DNS.
+    Names go through getaddrinfo, so IPv6-only hosts resolve too; an IPv4
+    address is preferred when the host has both.
+    
+    Args:
+        host: Hostname or IP address
+        ttl: Seconds to keep a resolved address
+    
+    Returns:
+        (ip, family) tuple (raises socket.gaierror if unresolvable)
+    """
+    now = time.monotonic()
+    
+    with _dns_cache_lock:
+        cached = _dns_cache.get(host)
+        if cached and cached[1] > now:
+            return cached[0]
+    
+    try:
+        infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM,
+                                   flags=socket.AI_NUMERICHOST)
+    except socket.gaierror:
+        infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM,
+                                   flags=socket.AI_ADDRCONFIG)
+    
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    family, _, _, _, address = infos[0]
+    resolved = (address[0], family)
+    
+    with _dns_cache_lock:
+        _dns_cache[host] = (resolved, now + ttl)
+    
+    return resolved
+
+
 def resolve_target(target):
     """
     Resolve hostname to IP address
@@ -64,7 +185,7 @@ def resolve_target(target):
         IP address string
     """
     try:
-        ip = socket.gethostbyname(target)
+        ip, _ = resolve_address(target)
         return ip
     except socket.gaierror:
         print(f"{Colors.FAIL}[!] Error: Cannot resolve hostname '{target}'{Colors.ENDC}")
@@ -87,10 +208,8 @@ def grab_banner(ip, port, timeout=2):
         Banner string or None
     """
     try:
-        # Create a socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect((ip, port))
+        # Create a socket (create_connection picks IPv4 or IPv6 for us)
+        sock = socket.create_connection((ip, port), timeout=timeout)
         
         # Some services send a banner automatically (like SSH, FTP)
         banner = sock.recv(1024).decode('utf-8', errors='ignore').strip()
@@ -119,18 +238,25 @@ def scan_port(ip, port, timeout=1, grab_banners=True):
     """
     try:
         # Create a TCP socket (SOCK_STREAM = TCP)
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        family = resolve_address(ip)[1]
+        sock = new_scan_socket(family)
         sock.settimeout(timeout)
         
         # Try to connect - this is what actually checks if port is open
         result = sock.connect_ex((ip, port))
         
         if result == 0:  # Port is open!
-            service = COMMON_PORTS.get(port, "Unknown")
+            service = _common_get(port, "Unknown")
             banner = None
             
-            if grab_banners:
-                banner = grab_banner(ip, port)
+            # Read the greeting on the socket we already have open instead
+            # of reconnecting - and don't wait on services that never speak first
+            if grab_banners and port not in NO_SERVER_GREETING:
+                sock.settimeout(BANNER_TIMEOUT)
+                try:
+                    banner = sock.recv(1024).decode('utf-8', errors='ignore').strip() or None
+                except socket.error:
+                    banner = None
             
             sock.close()
             
@@ -168,80 +294,281 @@ def parse_ports(port_string):
     
     Returns:
         List of port numbers
+    
+    Raises:
+        ValueError: If a port is not a number or falls outside 1-65535
     """
-    ports = set()
+    ranges = []
     
     for part in port_string.split(','):
         if '-' in part:
             # It's a range like "1-1000"
             start, end = part.split('-')
-            ports.update(range(int(start), int(end) + 1))
+            ranges.append((int(start), int(end)))
         else:
             # It's a single port
-            ports.add(int(part))
+            port = int(part)
+            ranges.append((port, port))
+    
+    for start, end in ranges:
+        if not (1 <= start <= 65535 and 1 <= end <= 65535):
+            raise ValueError(f"port out of range in {port_string!r}")
+    
+    # Merge overlapping ranges instead of hashing every port into a set -
+    # "1-65535" is one range, not 65535 set inserts and a sort
+    merged = []
+    for start, end in sorted(r for r in ranges if r[0] <= r[1]):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    ports = []
+    for start, end in merged:
+        ports.extend(range(start, end + 1))
+    
+    return ports
+
+
+def probe_ports(ip, ports, concurrency=50, timeout=1, grab_banners=True,
+                family=socket.AF_INET, stop=None):
+    """
+    Scan many ports from a single thread with non-blocking sockets
     
-    return sorted(list(ports))
+    Instead of parking one thread per connect(), we start up to
+    `concurrency` connects at once and let the kernel tell us (through
+    a selector) which ones finished. Open ports are kept on the same
+    socket while we wait for a banner.
+    
+    Args:
+        ip: Target IP address
+        ports: Iterable of port numbers
+        concurrency: Maximum number of connections in flight
+        timeout: Connect timeout per port
+        grab_banners: Whether to wait for a service banner on open ports
+        family: Address family of `ip` (AF_INET or AF_INET6)
+        stop: Optional threading.Event - once set, the scan ends early
+    
+    Yields:
+        (port, result) tuples - result is the scan_port() dict or None
+    
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    selector = selectors.DefaultSelector()
+    pending = deque(ports)
+    
+    def finish(sock):
+        selector.unregister(sock)
+        sock.close()
+    
+    def opened(port, banner=None):
+        return {
+            'port': port,
+            'state': 'open',
+            'service': _common_get(port, "Unknown"),
+            'banner': banner if banner else None
+        }
+    
+    try:
+        while pending or selector.get_map():
+            if stop is not None and stop.is_set():
+                break
+            
+            # Top up the in-flight window
+            while pending and len(selector.get_map()) < concurrency:
+                port = pending.popleft()
+                
+                try:
+                    sock = new_scan_socket(family)
+                except OSError:
+                    # Out of file descriptors - retry once some close
+                    if selector.get_map():
+                        pending.appendleft(port)
+                        break
+                    raise
+                
+                sock.setblocking(False)
+                result = sock.connect_ex((ip, port))
+                
+                if result not in CONNECT_IN_PROGRESS:
+                    sock.close()
+                    yield port, None
+                    continue
+                
+                # data = [port, stage, deadline]
+                selector.register(sock, selectors.EVENT_WRITE,
+                                  [port, 'connect', time.monotonic() + timeout])
+            
+            if not selector.get_map():
+                continue
+            
+            now = time.monotonic()
+            next_deadline = min(key.data[2] for key in selector.get_map().values())
+            events = selector.select(max(next_deadline - now, 0))
+            
+            for key, _ in events:
+                sock = key.fileobj
+                port, stage, _ = key.data
+                
+                if stage == 'connect':
+                    # Writable means the handshake finished - SO_ERROR says how
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                        finish(sock)
+                        yield port, None
+                    elif grab_banners and port not in NO_SERVER_GREETING:
+                        selector.modify(sock, selectors.EVENT_READ,
+                                        [port, 'banner', time.monotonic() + BANNER_TIMEOUT])
+                    else:
+                        finish(sock)
+                        yield port, opened(port)
+                else:
+                    try:
+                        banner = sock.recv(1024).decode('utf-8', errors='ignore').strip()
+                    except OSError:
+                        banner = None
+                    
+                    finish(sock)
+                    yield port, opened(port, banner)
+            
+            # Anything past its deadline: no SYN-ACK means filtered,
+            # no banner means open but quiet
+            now = time.monotonic()
+            for key in list(selector.get_map().values()):
+                port, stage, deadline = key.data
+                
+                if deadline > now:
+                    continue
+                
+                finish(key.fileobj)
+                
+                yield port, None if stage == 'connect' else opened(port)
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+
 
+def host_is_up(ip, family=socket.AF_INET, ports=ALIVE_PROBE_PORTS, timeout=2):
+    """
+    Quick check that a host answers at all before scanning it
+    
+    We fire non-blocking connects at a few common ports. Either an
+    accepted connection or a refusal (RST) proves something is there;
+    silence on all of them within `timeout` means down or firewalled.
+    
+    Args:
+        ip: Target IP address
+        family: Address family of `ip`
+        ports: Ports to probe
+        timeout: Total time budget in seconds
+    
+    Returns:
+        True if the host answered on any probe port
+    """
+    selector = selectors.DefaultSelector()
+    answered = (0, errno.ECONNREFUSED)
+    
+    try:
+        for port in ports:
+            sock = new_scan_socket(family)
+            sock.setblocking(False)
+            result = sock.connect_ex((ip, port))
+            
+            if result == errno.ECONNREFUSED:
+                sock.close()
+                return True
+            if result not in CONNECT_IN_PROGRESS:
+                sock.close()
+                continue
+            
+            selector.register(sock, selectors.EVENT_WRITE)
+        
+        deadline = time.monotonic() + timeout
+        
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            for key, _ in selector.select(remaining):
+                if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) in answered:
+                    return True
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+        
+        return False
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
 
-def scan_target(target, ports, threads=50, timeout=1, verbose=False):
+
+def scan_target(target, ports, threads=50, timeout=1, verbose=False, force=False,
+                force_hint="Use --force to scan it anyway", stop=None):
     """
     Main scanning function - orchestrates the whole scan
     
-    This uses ThreadPoolExecutor for concurrent scanning.
-    Why? Scanning ports one-by-one is SLOW. Threading makes it fast!
+    This uses probe_ports() to keep many connects in flight at once.
+    Why? Scanning ports one-by-one is SLOW, and a thread per port spends
+    most of its time asleep. One selector loop does the same job faster!
     
     Args:
         target: Target hostname or IP
         ports: List of ports to scan
-        threads: Number of concurrent threads
+        threads: Number of concurrent connections
         timeout: Socket timeout
         verbose: Print verbose output
+        force: Scan even if the host doesn't answer the liveness probe
+        force_hint: How the caller lets the user force a skipped scan
+        stop: Optional threading.Event that ends the scan early
     
     Returns:
         List of open port information
     """
     ip = resolve_target(target)
+    family = resolve_address(ip)[1]
+    
+    # A dead or fully firewalled host would make every port sit out its
+    # timeout - check it answers at all before committing to the scan
+    if not force and not host_is_up(ip, family):
+        ports_list = ', '.join(str(p) for p in ALIVE_PROBE_PORTS)
+        print(f"{Colors.WARNING}[!] {target} ({ip}) did not answer on ports {ports_list} - looks down, skipping scan{Colors.ENDC}")
+        print(f"{Colors.WARNING}[!] {force_hint}{Colors.ENDC}\n")
+        return []
     
     print(f"{Colors.OKBLUE}[*] Target: {target} ({ip}){Colors.ENDC}")
-    print(f"{Colors.OKBLUE}[*] Scanning {len(ports)} ports with {threads} threads{Colors.ENDC}")
-    print(f"{Colors.OKBLUE}[*] Scan started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
+    print(f"{Colors.OKBLUE}[*] Scanning {len(ports)} ports with {threads} concurrent connections{Colors.ENDC}")
+    started = datetime.now()
+    print(f"{Colors.OKBLUE}[*] Scan started at: {started:%Y-%m-%d %H:%M:%S}{Colors.ENDC}")
     print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}\n")
     
     open_ports = []
     
-    # Use ThreadPoolExecutor for concurrent scanning
-    # This is WAY faster than scanning sequentially!
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        # Submit all scan jobs
-        future_to_port = {
-            executor.submit(scan_port, ip, port, timeout): port 
-            for port in ports
-        }
-        
+    try:
         # Process results as they complete
-        for future in as_completed(future_to_port):
-            port = future_to_port[future]
-            
-            try:
-                result = future.result()
-                
-                if result:  # Port is open!
-                    open_ports.append(result)
-                    
-                    # Print the finding
-                    banner_info = f" - {result['banner'][:50]}..." if result['banner'] else ""
-                    print(f"{Colors.OKGREEN}[+] Port {result['port']}/tcp OPEN - {result['service']}{banner_info}{Colors.ENDC}")
+        for port, result in probe_ports(ip, ports, concurrency=threads, timeout=timeout,
+                                        family=family, stop=stop):
+            if result:  # Port is open!
+                open_ports.append(result)
                 
-                elif verbose:
-                    # Only show closed ports in verbose mode
-                    print(f"{Colors.FAIL}[-] Port {port}/tcp CLOSED{Colors.ENDC}")
-                    
-            except Exception as e:
-                if verbose:
-                    print(f"{Colors.WARNING}[!] Error scanning port {port}: {e}{Colors.ENDC}")
+                # Print the finding
+                banner_info = f" - {result['banner'][:50]}..." if result['banner'] else ""
+                print(OPEN_LINE.format(result['port'], result['service'], banner_info))
+            
+            elif verbose:
+                # Only show closed ports in verbose mode
+                print(CLOSED_LINE.format(port))
+    
+    except OSError as e:
+        print(f"{Colors.WARNING}[!] Error while scanning: {e}{Colors.ENDC}")
     
+    finished = datetime.now()
     print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.OKBLUE}[*] Scan completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
+    print(f"{Colors.OKBLUE}[*] Scan completed at: {finished:%Y-%m-%d %H:%M:%S} ({(finished - started).total_seconds():.1f}s){Colors.ENDC}")
     print(f"{Colors.OKGREEN}[*] Found {len(open_ports)} open ports{Colors.ENDC}\n")
     
     return open_ports
@@ -268,15 +595,20 @@ Examples:
     parser.add_argument('-p', '--ports', default='21,22,23,25,53,80,110,143,443,445,3306,3389,5432,8080',
                         help='Ports to scan (default: common ports). Format: 80,443 or 1-1000')
     parser.add_argument('-T', '--threads', type=int, default=50, 
-                        help='Number of threads (default: 50)')
+                        help='Number of concurrent connections (default: 50)')
     parser.add_argument('--timeout', type=float, default=1.0,
                         help='Socket timeout in seconds (default: 1.0)')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Verbose output (show closed ports)')
     parser.add_argument('-o', '--output', help='Output results to JSON file')
+    parser.add_argument('--force', action='store_true',
+                        help='Scan even if the host does not answer the liveness probe')
     
     args = parser.parse_args()
     
+    if args.threads < 1:
+        parser.error("--threads must be at least 1")
+    
     # Parse port specification
     try:
         ports = parse_ports(args.ports)
@@ -291,7 +623,8 @@ Examples:
             ports=ports,
             threads=args.threads,
             timeout=args.timeout,
-            verbose=args.verbose
+            verbose=args.verbose,
+            force=args.force
         )
         
         # Save to JSON if requested
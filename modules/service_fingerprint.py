@@ -5,9 +5,46 @@ Identifies services and versions from banners and responses
 """
 
 import socket
+import selectors
+import functools
+import time
 import re
+from collections import deque
 from typing import Dict, Optional, List
 
+from .port_scanner import CONNECT_IN_PROGRESS
+
+
+def _compile_signatures(signatures: Dict) -> tuple:
+    """
+    Fold every signature into one alternation so a single search checks them all
+    
+    Each pattern is wrapped in a named group (g0, g1, ...). The returned
+    table maps that name back to the service name and the position of the
+    pattern's own version groups inside the combined regex. The result is
+    a bytes pattern so raw banners can be searched without decoding them.
+    
+    Args:
+        signatures: {service_type: [(pattern, service_name), ...]}
+        
+    Returns:
+        (compiled pattern, {group name: (service_name, first_group, group_count)})
+    """
+    parts = []
+    groups = {}
+    index = 1
+    
+    for patterns in signatures.values():
+        for pattern, service_name in patterns:
+            name = f'g{len(parts)}'
+            count = re.compile(pattern).groups
+            parts.append(f'(?P<{name}>{pattern})')
+            groups[name] = (service_name, index + 1, count)
+            index += 1 + count
+    
+    return re.compile('|'.join(parts).encode(), re.IGNORECASE), groups
+
+
 class ServiceFingerprinter:
     """
     Service fingerprinting through banner analysis and probe responses
@@ -48,14 +85,34 @@ class ServiceFingerprinter:
         ]
     }
     
+    # All signatures compiled once into a single regex - one search per banner.
+    # The leftmost match wins; patterns matching at the same spot go in table order.
+    SIGNATURE_PATTERN, SIGNATURE_GROUPS = _compile_signatures(SIGNATURES)
+    
+    # Port-based identification (fallback when no signature matches)
+    PORT_SERVICES = {
+        21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
+        53: 'dns', 80: 'http', 110: 'pop3', 143: 'imap',
+        443: 'https', 445: 'smb', 3306: 'mysql', 3389: 'rdp',
+        5432: 'postgresql', 5900: 'vnc', 6379: 'redis',
+        8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
+    }
+    
+    # Ports that get the HTTP probe instead of a passive banner read
+    HTTP_PORTS = {80, 443, 8080, 8000, 8443}
+    
     # HTTP probes to send
     HTTP_PROBE = b"HEAD / HTTP/1.0\r\nHost: target\r\n\r\n"
     
     # Generic probe for other services
     GENERIC_PROBE = b"\r\n"
     
+    # Only the header block matters for HTTP - stop reading once it ends
+    HEADER_END = b"\r\n\r\n"
+    MAX_HEADER_BYTES = 4096
+    
     @staticmethod
-    def grab_banner(ip: str, port: int, timeout: int = 3) -> Optional[str]:
+    def grab_banner(ip: str, port: int, timeout: int = 3) -> Optional[bytes]:
         """
         Grab banner from service
         
@@ -65,15 +122,13 @@ class ServiceFingerprinter:
             timeout: Connection timeout
             
         Returns:
-            Banner string or None
+            Raw banner bytes or None
         """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            sock.connect((ip, port))
+            sock = socket.create_connection((ip, port), timeout=timeout)
             
             # Wait for automatic banner
-            banner = sock.recv(4096).decode('utf-8', errors='ignore').strip()
+            banner = sock.recv(4096).strip()
             
             sock.close()
             return banner if banner else None
@@ -82,7 +137,7 @@ class ServiceFingerprinter:
             return None
     
     @staticmethod
-    def http_probe(ip: str, port: int, timeout: int = 3) -> Optional[str]:
+    def http_probe(ip: str, port: int, timeout: int = 3) -> Optional[bytes]:
         """
         Send HTTP probe to get server header
         
@@ -92,68 +147,79 @@ class ServiceFingerprinter:
             timeout: Connection timeout
             
         Returns:
-            HTTP response headers or None
+            Raw HTTP response headers or None
         """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            sock.connect((ip, port))
-            
+            sock = socket.create_connection((ip, port), timeout=timeout)
+        except Exception:
+            return None
+        
+        response = bytearray()
+        try:
             # Send HTTP HEAD request
             sock.send(ServiceFingerprinter.HTTP_PROBE)
-            response = sock.recv(4096).decode('utf-8', errors='ignore')
-            
-            sock.close()
-            return response
             
+            # Read until the blank line that ends the headers
+            while len(response) < ServiceFingerprinter.MAX_HEADER_BYTES:
+                chunk = sock.recv(ServiceFingerprinter.MAX_HEADER_BYTES - len(response))
+                if not chunk:
+                    break
+                response += chunk
+                end = response.find(ServiceFingerprinter.HEADER_END)
+                if end != -1:
+                    del response[end + len(ServiceFingerprinter.HEADER_END):]
+                    break
         except Exception:
-            return None
+            # Timed out or reset - keep whatever headers arrived
+            pass
+        finally:
+            sock.close()
+        
+        return bytes(response) or None
     
     @staticmethod
-    def identify_service(port: int, banner: Optional[str] = None) -> Dict[str, str]:
+    def identify_service(port: int, banner: Optional[bytes] = None) -> Dict[str, str]:
         """
         Identify service based on port and banner
         
         Args:
             port: Port number
-            banner: Service banner
+            banner: Raw service banner (str is accepted too)
             
         Returns:
             Dictionary with service information
         """
-        result = {
-            'service': 'unknown',
-            'version': 'unknown',
-            'details': ''
-        }
+        if isinstance(banner, str):
+            banner = banner.encode('utf-8')
         
-        # Port-based identification (fallback)
-        port_services = {
-            21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
-            53: 'dns', 80: 'http', 110: 'pop3', 143: 'imap',
-            443: 'https', 445: 'smb', 3306: 'mysql', 3389: 'rdp',
-            5432: 'postgresql', 5900: 'vnc', 6379: 'redis',
-            8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
+        service, version, details = ServiceFingerprinter._identify(port, banner or None)
+        return {
+            'service': service,
+            'version': version,
+            'details': details
         }
-        
-        if port in port_services:
-            result['service'] = port_services[port]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _identify(port: int, banner: Optional[bytes]) -> tuple:
+        # Pure function of (port, banner) - hosts in a sweep mostly run the same
+        # images, so each distinct banner only goes through the regex once
+        service = ServiceFingerprinter.PORT_SERVICES.get(port, 'unknown')
+        version = 'unknown'
+        details = ''
         
         # Banner-based identification (more accurate)
         if banner:
-            result['details'] = banner[:100]
+            details = banner[:100].decode('utf-8', errors='ignore')
             
             # Try to match against signatures
-            for service_type, patterns in ServiceFingerprinter.SIGNATURES.items():
-                for pattern, service_name in patterns:
-                    match = re.search(pattern, banner, re.IGNORECASE)
-                    if match:
-                        result['service'] = service_name
-                        if match.groups():
-                            result['version'] = ' '.join(match.groups())
-                        break
+            match = ServiceFingerprinter.SIGNATURE_PATTERN.search(banner)
+            if match:
+                service, first, count = ServiceFingerprinter.SIGNATURE_GROUPS[match.lastgroup]
+                if count:
+                    version = b' '.join(match.group(i) for i in range(first, first + count)).decode('utf-8', errors='ignore')
         
-        return result
+        return service, version, details
     
     @staticmethod
     def fingerprint_port(ip: str, port: int) -> Dict[str, any]:
@@ -167,40 +233,158 @@ class ServiceFingerprinter:
         Returns:
             Complete fingerprint information
         """
-        banner = None
-        
         # Special handling for HTTP/HTTPS
-        if port in [80, 443, 8080, 8000, 8443]:
+        if port in ServiceFingerprinter.HTTP_PORTS:
             banner = ServiceFingerprinter.http_probe(ip, port)
         else:
             banner = ServiceFingerprinter.grab_banner(ip, port)
         
+        return ServiceFingerprinter.fingerprint_result(port, banner)
+    
+    @staticmethod
+    def fingerprint_result(port: int, banner: Optional[bytes]) -> Dict[str, any]:
+        """
+        Build the fingerprint record for a port from its banner
+        
+        Args:
+            port: Target port
+            banner: Raw banner or HTTP response collected from the port
+            
+        Returns:
+            Complete fingerprint information
+        """
         service_info = ServiceFingerprinter.identify_service(port, banner)
         
         return {
             'port': port,
-            'banner': banner,
+            # only decoded here, for display and the JSON report
+            'banner': banner.decode('utf-8', errors='ignore') if banner else banner,
             'service': service_info['service'],
             'version': service_info['version'],
             'details': service_info['details']
         }
 
 
-def fingerprint_target(ip: str, ports: List[int]) -> List[Dict]:
+def fingerprint_target(ip: str, ports: List[int], timeout: int = 3,
+                       concurrency: int = 100) -> List[Dict]:
     """
     Fingerprint multiple ports on a target
     
+    Ports are probed from one thread, up to `concurrency` at a time:
+    sockets are non-blocking and a selector tells us when each connect
+    finishes (send the HTTP probe if needed) and when each banner arrives.
+    The window refills as sockets finish, so a long port list neither
+    waits one timeout per port nor runs out of file descriptors.
+    
     Args:
         ip: Target IP address
         ports: List of open ports to fingerprint
+        timeout: Connect and read timeout per port
+        concurrency: Maximum number of sockets open at once
         
     Returns:
         List of fingerprint results
+    
+    Raises:
+        ValueError: If concurrency is less than 1
+        OSError: If no socket can be created at all (e.g. out of file descriptors)
     """
-    results = []
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    banners = {}
+    pending = deque(ports)
+    selector = selectors.DefaultSelector()
     
-    for port in ports:
-        result = ServiceFingerprinter.fingerprint_port(ip, port)
-        results.append(result)
+    def finish(sock, port, banner):
+        selector.unregister(sock)
+        sock.close()
+        banners[port] = banner
+    
+    try:
+        while pending or selector.get_map():
+            # Top up the in-flight window
+            while pending and len(selector.get_map()) < concurrency:
+                port = pending.popleft()
+                
+                try:
+                    family, _, _, _, address = socket.getaddrinfo(ip, port, type=socket.SOCK_STREAM)[0]
+                except socket.gaierror:
+                    banners[port] = None
+                    continue
+                
+                try:
+                    sock = socket.socket(family, socket.SOCK_STREAM)
+                except OSError:
+                    # Out of file descriptors - retry once some close
+                    if selector.get_map():
+                        pending.appendleft(port)
+                        break
+                    raise
+                
+                sock.setblocking(False)
+                if sock.connect_ex(address) not in CONNECT_IN_PROGRESS:
+                    sock.close()
+                    banners[port] = None
+                    continue
+                
+                # data = [port, deadline, bytes read so far]
+                selector.register(sock, selectors.EVENT_WRITE, [port, time.monotonic() + timeout, bytearray()])
+            
+            if not selector.get_map():
+                continue
+            
+            now = time.monotonic()
+            next_deadline = min(key.data[1] for key in selector.get_map().values())
+            
+            for key, mask in selector.select(max(next_deadline - now, 0)):
+                sock = key.fileobj
+                port = key.data[0]
+                is_http = port in ServiceFingerprinter.HTTP_PORTS
+                
+                if mask & selectors.EVENT_WRITE:
+                    # Connect finished - did it work?
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                        finish(sock, port, None)
+                        continue
+                    
+                    if is_http:
+                        try:
+                            sock.send(ServiceFingerprinter.HTTP_PROBE)
+                        except OSError:
+                            finish(sock, port, None)
+                            continue
+                    
+                    key.data[1] = time.monotonic() + timeout
+                    selector.modify(sock, selectors.EVENT_READ, key.data)
+                else:
+                    try:
+                        data = sock.recv(4096)
+                    except OSError:
+                        finish(sock, port, bytes(key.data[2]) or None)
+                        continue
+                    
+                    if not is_http:
+                        finish(sock, port, data.strip() or None)
+                        continue
+                    
+                    # HTTP: keep reading until the header block is complete
+                    response = key.data[2]
+                    response += data
+                    end = response.find(ServiceFingerprinter.HEADER_END)
+                    if end != -1:
+                        finish(sock, port, bytes(response[:end + len(ServiceFingerprinter.HEADER_END)]))
+                    elif not data or len(response) >= ServiceFingerprinter.MAX_HEADER_BYTES:
+                        finish(sock, port, bytes(response[:ServiceFingerprinter.MAX_HEADER_BYTES]) or None)
+            
+            # Deadline passed - use whatever partial headers arrived
+            now = time.monotonic()
+            for key in list(selector.get_map().values()):
+                if key.data[1] <= now:
+                    finish(key.fileobj, key.data[0], bytes(key.data[2]) or None)
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
     
-    return results
+    return [ServiceFingerprinter.fingerprint_result(port, banners.get(port)) for port in ports]
@@ -53,6 +53,22 @@ class StressTester:
             'start_time': None,
             'errors': []
         }
+        
+        # Unique error messages, shared by all worker threads
+        self._seen_errors = set()
+        self._errors_lock = threading.Lock()
+    
+    def _record_error(self, message: str):
+        """
+        Remember an error message once, in the order first seen
+        
+        Args:
+            message: Error description
+        """
+        with self._errors_lock:
+            if message not in self._seen_errors:
+                self._seen_errors.add(message)
+                self.stats['errors'].append(message)
     
     def http_flood(self, threads: int = 100, duration: int = 60, method: str = 'GET'):
         """
@@ -99,8 +115,7 @@ class StressTester:
                         print("[!] Target appears to be down!")
                 except Exception as e:
                     self.stats['requests_failed'] += 1
-                    if str(e) not in self.stats['errors']:
-                        self.stats['errors'].append(str(e))
+                    self._record_error(str(e))
         
         # Launch threads
         with ThreadPoolExecutor(max_workers=threads) as executor:
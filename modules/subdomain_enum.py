@@ -5,13 +5,26 @@ DNS-based subdomain discovery through brute force and zone transfers
 """
 
 import socket
+import asyncio
 import dns.resolver
+import dns.asyncresolver
 import dns.zone
 import dns.query
 import requests
+from requests.adapters import HTTPAdapter
 import re
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
+
+# A usable subdomain prefix: one or more DNS labels, each 1-63 chars of
+# a-z0-9- plus '_' (service labels such as _dmarc or _sip._tcp)
+_VALID_LABEL = re.compile(r'^[a-z0-9_-]{1,63}(\.[a-z0-9_-]{1,63})*$')
+
+# Shared across enumerator instances so repeat crt.sh queries reuse the
+# kept-alive TLS connection (requests already asks for gzip)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
 
 class SubdomainEnumerator:
     """
@@ -34,7 +47,8 @@ class SubdomainEnumerator:
         'ipv4', 'gateway', 'public', 'prod', 'production', 'sandbox', 'alpha'
     ]
     
-    def __init__(self, domain: str, wordlist: List[str] = None, threads: int = 20):
+    def __init__(self, domain: str, wordlist: List[str] = None, threads: int = 20,
+                 stop: Optional[threading.Event] = None):
         """
         Initialize subdomain enumerator
         
@@ -42,11 +56,34 @@ class SubdomainEnumerator:
             domain: Target domain
             wordlist: Custom subdomain wordlist (uses default if None)
             threads: Number of concurrent threads
+            stop: Event that, once set, makes pending lookups give up
         """
         self.domain = domain
-        self.wordlist = wordlist if wordlist else self.COMMON_SUBDOMAINS
+        self.wordlist = self.clean_wordlist(wordlist) if wordlist else self.COMMON_SUBDOMAINS
         self.threads = threads
+        self.stop = stop or threading.Event()
         self.found_subdomains = set()
+        
+        # One resolver for every lookup, with a shared answer cache so repeated
+        # names (wordlist, CT logs, nameservers) only go out on the wire once
+        self.resolver = dns.resolver.Resolver()
+        self.resolver.cache = dns.resolver.LRUCache(max_size=4096)
+        self.resolver.timeout = 1
+        self.resolver.lifetime = 2
+    
+    @staticmethod
+    def clean_wordlist(wordlist: List[str]) -> List[str]:
+        """
+        Drop duplicates and entries that can't be valid labels before any DNS goes out
+        
+        Args:
+            wordlist: Raw subdomain wordlist
+            
+        Returns:
+            Lowercased, deduplicated wordlist in original order
+        """
+        words = dict.fromkeys(word.strip().lower() for word in wordlist)
+        return [word for word in words if _VALID_LABEL.match(word)]
     
     def check_subdomain(self, subdomain: str) -> Dict[str, any]:
         """
@@ -62,7 +99,7 @@ class SubdomainEnumerator:
         
         try:
             # Try A record lookup
-            answers = dns.resolver.resolve(full_domain, 'A', lifetime=2)
+            answers = self.resolver.resolve(full_domain, 'A')
             ips = [str(rdata) for rdata in answers]
             
             return {
@@ -77,7 +114,7 @@ class SubdomainEnumerator:
         except dns.resolver.NoAnswer:
             # Try CNAME
             try:
-                answers = dns.resolver.resolve(full_domain, 'CNAME', lifetime=2)
+                answers = self.resolver.resolve(full_domain, 'CNAME')
                 cnames = [str(rdata) for rdata in answers]
                 return {
                     'subdomain': full_domain,
@@ -89,26 +126,126 @@ class SubdomainEnumerator:
         except Exception:
             return None
     
+    async def _check_subdomain_async(self, resolver, limit, subdomain: str) -> Dict[str, any]:
+        """
+        Async twin of check_subdomain, bounded by a shared semaphore
+        
+        Args:
+            resolver: dns.asyncresolver.Resolver to query with
+            limit: asyncio.Semaphore capping in-flight lookups
+            subdomain: Subdomain to check
+            
+        Returns:
+            Dictionary with subdomain info or None
+        """
+        full_domain = f"{subdomain}.{self.domain}"
+        
+        async with limit:
+            if self.stop.is_set():
+                return None
+            
+            try:
+                answers = await resolver.resolve(full_domain, 'A')
+                return {
+                    'subdomain': full_domain,
+                    'ips': [str(rdata) for rdata in answers],
+                    'type': 'A'
+                }
+            except dns.resolver.NXDOMAIN:
+                return None
+            except dns.resolver.NoAnswer:
+                # Try CNAME
+                try:
+                    answers = await resolver.resolve(full_domain, 'CNAME')
+                    return {
+                        'subdomain': full_domain,
+                        'cnames': [str(rdata) for rdata in answers],
+                        'type': 'CNAME'
+                    }
+                except Exception:
+                    return None
+            except Exception:
+                return None
+    
+    def _async_resolver(self):
+        resolver = dns.asyncresolver.Resolver()
+        # share the sync resolver's cache and timeouts so both paths agree
+        resolver.cache = self.resolver.cache
+        resolver.timeout = self.resolver.timeout
+        resolver.lifetime = self.resolver.lifetime
+        return resolver
+    
+    async def _brute_force_async(self) -> List[Dict]:
+        resolver = self._async_resolver()
+        limit = asyncio.Semaphore(self.threads)
+        return await asyncio.gather(*(
+            self._check_subdomain_async(resolver, limit, sub)
+            for sub in self.wordlist
+        ))
+    
+    async def _resolve_ips_async(self, domains: List[str]) -> List[List[str]]:
+        resolver = self._async_resolver()
+        limit = asyncio.Semaphore(self.threads)
+        
+        async def lookup(domain):
+            async with limit:
+                if self.stop.is_set():
+                    return None
+                
+                try:
+                    answers = await resolver.resolve(domain, 'A')
+                    return [str(rdata) for rdata in answers]
+                except Exception:
+                    return None
+        
+        return await asyncio.gather(*(lookup(domain) for domain in domains))
+    
     def brute_force(self) -> List[Dict]:
         """
         Brute force subdomain enumeration
         
+        Lookups run on one event loop instead of a thread per query;
+        self.threads caps how many are in flight at once.
+        
         Returns:
             List of found subdomains
         """
+        results = [r for r in asyncio.run(self._brute_force_async()) if r]
+        self.found_subdomains.update(r['subdomain'] for r in results)
+        return results
+    
+    def _transfer_from(self, ns: str) -> List[Dict]:
+        """
+        Attempt a zone transfer against a single nameserver
+        
+        Args:
+            ns: Nameserver hostname
+            
+        Returns:
+            List of records, or empty if the transfer was refused
+        """
         results = []
         
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            future_to_sub = {
-                executor.submit(self.check_subdomain, sub): sub 
-                for sub in self.wordlist
-            }
+        try:
+            # Get NS IP
+            ns_ip = str(self.resolver.resolve(ns, 'A', lifetime=5)[0])
             
-            for future in as_completed(future_to_sub):
-                result = future.result()
-                if result:
-                    results.append(result)
-                    self.found_subdomains.add(result['subdomain'])
+            # Attempt zone transfer
+            zone = dns.zone.from_xfr(dns.query.xfr(ns_ip, self.domain, timeout=10))
+            
+            # Extract records
+            for name, node in zone.nodes.items():
+                subdomain = str(name) if str(name) != '@' else self.domain
+                full_domain = f"{subdomain}.{self.domain}" if subdomain != self.domain else self.domain
+                
+                results.append({
+                    'subdomain': full_domain,
+                    'source': 'zone_transfer',
+                    'nameserver': ns
+                })
+                
+        except Exception:
+            pass
         
         return results
     
@@ -123,33 +260,18 @@ class SubdomainEnumerator:
         
         try:
             # Find nameservers
-            ns_records = dns.resolver.resolve(self.domain, 'NS', lifetime=5)
+            ns_records = self.resolver.resolve(self.domain, 'NS', lifetime=5)
             nameservers = [str(rdata) for rdata in ns_records]
-            
-            for ns in nameservers:
-                try:
-                    # Get NS IP
-                    ns_ip = str(dns.resolver.resolve(ns, 'A', lifetime=5)[0])
-                    
-                    # Attempt zone transfer
-                    zone = dns.zone.from_xfr(dns.query.xfr(ns_ip, self.domain, timeout=10))
-                    
-                    # Extract records
-                    for name, node in zone.nodes.items():
-                        subdomain = str(name) if str(name) != '@' else self.domain
-                        full_domain = f"{subdomain}.{self.domain}" if subdomain != self.domain else self.domain
-                        
-                        results.append({
-                            'subdomain': full_domain,
-                            'source': 'zone_transfer',
-                            'nameserver': ns
-                        })
-                        
-                except Exception:
-                    continue
-                    
         except Exception:
-            pass
+            return results
+        
+        if not nameservers:
+            return results
+        
+        # try every NS at once, a refusing one shouldn't hold up the rest
+        with ThreadPoolExecutor(max_workers=len(nameservers)) as executor:
+            for records in executor.map(self._transfer_from, nameservers):
+                results.extend(records)
         
         return results
     
@@ -170,50 +292,45 @@ class SubdomainEnumerator:
         try:
             # Query crt.sh API
             url = f"https://crt.sh/?q=%.{self.domain}&output=json"
-            response = requests.get(url, timeout=30)
+            response = _SESSION.get(url, timeout=30)
             
             if response.status_code == 200:
                 certs = response.json()
                 
                 for cert in certs:
-                    # Extract common name and name values
-                    name_value = cert.get('name_value', '')
-                    
                     # Split by newlines (multiple domains in one cert)
-                    domains = name_value.split('\n')
-                    
-                    for domain in domains:
-                        domain = domain.strip().lower()
-                        
+                    for domain in cert.get('name_value', '').split('\n'):
                         # Remove wildcard prefix
-                        domain = domain.replace('*.', '')
+                        domain = domain.strip().lower().replace('*.', '')
                         
                         # Only include subdomains of our target
-                        if domain.endswith(self.domain) and domain not in found:
+                        if domain.endswith(self.domain):
                             found.add(domain)
-                            
-                            # Try to resolve it to verify it's active
-                            try:
-                                answers = dns.resolver.resolve(domain, 'A', lifetime=2)
-                                ips = [str(rdata) for rdata in answers]
-                                
-                                results.append({
-                                    'subdomain': domain,
-                                    'ips': ips,
-                                    'source': 'cert_transparency'
-                                })
-                                self.found_subdomains.add(domain)
-                            except:
-                                # Still add it even if not currently resolving
-                                results.append({
-                                    'subdomain': domain,
-                                    'source': 'cert_transparency',
-                                    'status': 'not_resolving'
-                                })
         
         except Exception as e:
             pass
         
+        if not found:
+            return results
+        
+        # Resolve everything in one batch to verify which are active
+        domains = sorted(found)
+        for domain, ips in zip(domains, asyncio.run(self._resolve_ips_async(domains))):
+            if ips:
+                results.append({
+                    'subdomain': domain,
+                    'ips': ips,
+                    'source': 'cert_transparency'
+                })
+                self.found_subdomains.add(domain)
+            else:
+                # Still add it even if not currently resolving
+                results.append({
+                    'subdomain': domain,
+                    'source': 'cert_transparency',
+                    'status': 'not_resolving'
+                })
+        
         return results
     
     def enumerate(self, check_zone_transfer: bool = True, check_ct_logs: bool = True) -> Dict[str, any]:
@@ -235,29 +352,28 @@ class SubdomainEnumerator:
             'total_found': 0
         }
         
-        # Try zone transfer first (faster if it works)
+        # Zone transfer, CT logs and brute force don't depend on each other,
+        # so run them side by side instead of one after the other
+        steps = {'brute_force': self.brute_force}
         if check_zone_transfer:
-            zt_results = self.zone_transfer()
-            if zt_results:
-                results['zone_transfer'] = zt_results
-                results['total_found'] += len(zt_results)
-        
-        # Certificate Transparency lookup (finds subdomains beyond wordlist)
+            steps['zone_transfer'] = self.zone_transfer
         if check_ct_logs:
-            ct_results = self.cert_transparency()
-            if ct_results:
-                results['cert_transparency'] = ct_results
-                results['total_found'] += len(ct_results)
+            # Certificate Transparency lookup (finds subdomains beyond wordlist)
+            steps['cert_transparency'] = self.cert_transparency
         
-        # Brute force enumeration
-        bf_results = self.brute_force()
-        results['brute_force'] = bf_results
-        results['total_found'] += len(bf_results)
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            future_to_step = {executor.submit(func): step for step, func in steps.items()}
+            
+            for future in as_completed(future_to_step):
+                step_results = future.result()
+                results[future_to_step[future]] = step_results
+                results['total_found'] += len(step_results)
         
         return results
 
 
-def enumerate_subdomains(domain: str, wordlist: List[str] = None, threads: int = 20) -> Dict:
+def enumerate_subdomains(domain: str, wordlist: List[str] = None, threads: int = 20,
+                         stop: Optional[threading.Event] = None) -> Dict:
     """
     Enumerate subdomains for a target domain
     
@@ -265,9 +381,10 @@ def enumerate_subdomains(domain: str, wordlist: List[str] = None, threads: int =
         domain: Target domain
         wordlist: Optional custom wordlist
         threads: Number of concurrent threads
+        stop: Optional event to cut the enumeration short
         
     Returns:
         Enumeration results
     """
-    enumerator = SubdomainEnumerator(domain, wordlist, threads)
+    enumerator = SubdomainEnumerator(domain, wordlist, threads, stop)
     return enumerator.enumerate()
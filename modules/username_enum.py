@@ -4,8 +4,10 @@ Username Enumeration Module - OSINT
 Check username availability across 100+ platforms
 """
 
+import re
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 import time
 
@@ -29,7 +31,7 @@ class UsernameChecker:
         'Snapchat': 'https://www.snapchat.com/add/{}',
         'Telegram': 'https://t.me/{}',
         'Medium': 'https://medium.com/@{}',
-        'Tumblr': 'https://{}.tumblr.com',
+        'Tumblr': 'https://www.tumblr.com/{}',
         
         # Developer Platforms
         'GitLab': 'https://gitlab.com/{}',
@@ -52,7 +54,7 @@ class UsernameChecker:
         # Creative
         'Dribbble': 'https://dribbble.com/{}',
         'Behance': 'https://www.behance.net/{}',
-        'DeviantArt': 'https://{}.deviantart.com',
+        'DeviantArt': 'https://www.deviantart.com/{}',
         'ArtStation': 'https://www.artstation.com/{}',
         'SoundCloud': 'https://soundcloud.com/{}',
         'Spotify': 'https://open.spotify.com/user/{}',
@@ -83,6 +85,40 @@ class UsernameChecker:
         'WordPress': 'https://{}.wordpress.com',
     }
     
+    # Status code is enough for most platforms, so probe with HEAD and skip the
+    # body. These answer 200 for missing profiles too and need the page text.
+    PLATFORM_METHODS = {
+        'Twitter': 'GET',
+        'Instagram': 'GET',
+        'Facebook': 'GET',
+        'TikTok': 'GET',
+        'Snapchat': 'GET',
+        'Telegram': 'GET',
+        'Medium': 'GET',
+        'Tumblr': 'GET',
+        'Steam': 'GET',
+        'Xbox': 'GET',
+        'Roblox': 'GET',
+        'Spotify': 'GET',
+        'HackerNews': 'GET',
+        'Quora': 'GET',
+        'Blogger': 'GET',
+        'WordPress': 'GET',
+    }
+    
+    # Some sites show 200 even for non-existent profiles
+    FALSE_POSITIVE_PATTERN = re.compile(b'|'.join(map(re.escape, [
+        b'page not found',
+        b'user not found',
+        b'profile not found',
+        b'doesn\'t exist',
+        b'no user found'
+    ])), re.IGNORECASE)
+    
+    # Not-found notices sit near the top of the page, so only this much of the
+    # body is ever downloaded and scanned
+    FALSE_POSITIVE_SCAN_BYTES = 65536
+    
     def __init__(self, username: str, threads: int = 20, timeout: int = 5):
         """
         Initialize username checker
@@ -95,31 +131,51 @@ class UsernameChecker:
         self.username = username
         self.threads = threads
         self.timeout = timeout
+        # Profile URL for every platform, filled in once, in alphabetical order
+        self.urls = {
+            platform: self.PLATFORMS[platform].format(username)
+            for platform in sorted(self.PLATFORMS)
+        }
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Every platform is its own host, so keep a pool per host for the whole
+        # sweep (the default only caches 10) and let each grow to the worker count
+        adapter = HTTPAdapter(pool_connections=len(self.PLATFORMS), pool_maxsize=threads)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
-    def check_platform(self, platform: str, url_template: str) -> Dict:
+    def check_platform(self, platform: str, url: str) -> Dict:
         """
         Check if username exists on a platform
         
         Args:
             platform: Platform name
-            url_template: URL template with {} placeholder
+            url: Profile URL for the username
             
         Returns:
             Dictionary with platform check results
         """
         try:
-            url = url_template.format(self.username)
+            method = self.PLATFORM_METHODS.get(platform, 'HEAD')
             
-            response = self.session.get(
+            # GET bodies are streamed so the scan below can stop early
+            response = self.session.request(
+                method,
                 url,
                 timeout=self.timeout,
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
             
+            # A few servers refuse HEAD outright - ask again with GET
+            if response.status_code == 405 and method == 'HEAD':
+                method = 'GET'
+                response.close()
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+            
             # Different platforms use different status codes
             exists = False
             status_code = response.status_code
@@ -127,19 +183,10 @@ class UsernameChecker:
             if status_code == 200:
                 # Profile likely exists
                 # Additional checks for false positives
-                content = response.text.lower()
-                
-                # Some sites show 200 even for non-existent profiles
-                false_positive_indicators = [
-                    'page not found',
-                    'user not found',
-                    'profile not found',
-                    'doesn\'t exist',
-                    'no user found'
-                ]
-                
-                if not any(indicator in content for indicator in false_positive_indicators):
+                if method == 'HEAD':
                     exists = True
+                else:
+                    exists = not self.FALSE_POSITIVE_PATTERN.search(self.read_head(response))
             
             elif status_code == 404:
                 # Profile doesn't exist
@@ -149,6 +196,8 @@ class UsernameChecker:
                 # Uncertain (rate limited, requires login, etc.)
                 exists = None
             
+            response.close()
+            
             return {
                 'platform': platform,
                 'url': url,
@@ -159,18 +208,38 @@ class UsernameChecker:
         except requests.Timeout:
             return {
                 'platform': platform,
-                'url': url_template.format(self.username),
+                'url': url,
                 'exists': None,
                 'status_code': 'TIMEOUT'
             }
         except Exception as e:
             return {
                 'platform': platform,
-                'url': url_template.format(self.username),
+                'url': url,
                 'exists': None,
                 'status_code': 'ERROR'
             }
     
+    def read_head(self, response: requests.Response) -> bytes:
+        """
+        Read the start of a streamed response body
+        
+        Args:
+            response: Response opened with stream=True
+            
+        Returns:
+            Up to FALSE_POSITIVE_SCAN_BYTES of the decoded body
+        """
+        limit = self.FALSE_POSITIVE_SCAN_BYTES
+        head = bytearray()
+        
+        for chunk in response.iter_content(chunk_size=16384):
+            head += chunk
+            if len(head) >= limit:
+                break
+        
+        return bytes(head[:limit])
+    
     def check_all(self) -> Dict:
         """
         Check username across all platforms
@@ -186,28 +255,24 @@ class UsernameChecker:
             'total_checked': len(self.PLATFORMS)
         }
         
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+        buckets = {
+            True: results['found'],
+            False: results['not_found'],
+            None: results['unknown']
+        }
+        
+        with ThreadPoolExecutor(max_workers=min(self.threads, len(self.urls))) as executor:
             # Submit all checks
-            future_to_platform = {
-                executor.submit(self.check_platform, platform, url): platform
-                for platform, url in self.PLATFORMS.items()
-            }
+            futures = [
+                executor.submit(self.check_platform, platform, url)
+                for platform, url in self.urls.items()
+            ]
             
-            # Process results
-            for future in as_completed(future_to_platform):
+            # Collect in submission order, which is already alphabetical by
+            # platform, so the lists need no sorting afterwards
+            for future in futures:
                 result = future.result()
-                
-                if result['exists'] is True:
-                    results['found'].append(result)
-                elif result['exists'] is False:
-                    results['not_found'].append(result)
-                else:
-                    results['unknown'].append(result)
-        
-        # Sort results alphabetically by platform
-        results['found'].sort(key=lambda x: x['platform'])
-        results['not_found'].sort(key=lambda x: x['platform'])
-        results['unknown'].sort(key=lambda x: x['platform'])
+                buckets[result['exists']].append(result)
         
         return results
 
@@ -14,9 +14,20 @@ import sys
 import json
 from datetime import datetime
 import argparse
+import functools
+import threading
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# orjson encodes several times faster than json; fall back when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import our modules from modules package
-from modules.port_scanner import scan_target, resolve_target, parse_ports
+from modules.port_scanner import (scan_target, resolve_target, resolve_address, parse_ports,
+                                  blank_colors, disable_colors)
 from modules.service_fingerprint import fingerprint_target
 from modules.subdomain_enum import enumerate_subdomains
 from modules.web_crawler import crawl_website
@@ -40,14 +51,67 @@ class Colors:
     ENDC = '\033[0m'         # Reset color
 
 
+# Piped or redirected output (or NO_COLOR / --no-color) gets plain text - blank
+# every color before the banner and menu below are rendered from them
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR') or '--no-color' in sys.argv[1:]:
+    blank_colors(Colors)
+    
+    # The port scanner prints its own colored lines
+    disable_colors()
+
+
+# Default port lists, shared by the menu prompts and batch mode
+DEFAULT_SCAN_PORTS = "21,22,23,25,53,80,110,143,443,3306,8080"
+DEFAULT_FINGERPRINT_PORTS = "80,443,22,21"
+
+# Characters a target may contain that can't go into a filename on some OS
+# (dots are swapped too, as they always have been)
+FILENAME_SAFE = str.maketrans({c: '_' for c in './\\:?*<>|"\x00'})
+
+# Cursor home, clear screen, clear scrollback
+CLEAR_SEQUENCE = '\033[H\033[2J\033[3J'
+
+
+def enable_windows_ansi():
+    """
+    Switch a Windows 10+ console into VT mode so it understands ANSI escapes
+    
+    Returns:
+        True if the console now takes ANSI sequences
+    """
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+# Windows Terminal and ANSICON speak ANSI already, and Windows 10+ consoles
+# can be switched into it - only older consoles still need a cls subprocess
+USE_ANSI_CLEAR = (os.name != 'nt' or bool(os.environ.get('WT_SESSION') or os.environ.get('ANSICON'))
+                  or enable_windows_ansi())
+
+
 def clear_screen():
-    """Clear terminal screen"""
-    os.system('clear' if os.name != 'nt' else 'cls')
+    """Clear terminal screen (a no-op when output isn't a terminal)"""
+    if not sys.stdout.isatty():
+        return
+    
+    if USE_ANSI_CLEAR:
+        sys.stdout.write(CLEAR_SEQUENCE)
+        sys.stdout.flush()
+    else:
+        os.system('cls')
 
 
-def print_banner():
-    """Display main ASCII banner"""
-    banner = f"""{Colors.PURPLE}{Colors.BOLD}
+# Banner and menu never change, so both are rendered once at import
+BANNER = f"""{Colors.PURPLE}{Colors.BOLD}
 ╔══════════════════════════════════════════════════════════════════╗
 ║                                                                  ║
 ║   ██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
@@ -69,42 +133,102 @@ def print_banner():
 
 {Colors.RED}{Colors.BOLD}⚠  WARNING:{Colors.ENDC} {Colors.YELLOW}Unauthorized use of this tool is illegal.{Colors.ENDC}
 {Colors.GRAY}   Only test systems you own or have explicit permission to scan.{Colors.ENDC}
+
 """
-    print(banner)
+
+# Horizontal rules, built once instead of on every screen
+HEAVY_RULE = '═' * 68
+PURPLE_RULE = f"{Colors.PURPLE}{HEAVY_RULE}{Colors.ENDC}"
+CYAN_RULE = f"{Colors.CYAN}{'=' * 60}{Colors.ENDC}"
+GREEN_RULE = f"{Colors.GREEN}{'=' * 60}{Colors.ENDC}"
+
+MENU_ITEMS = [
+    ("1", "PORT SCANNER", "Scan for open ports", Colors.CYAN),
+    ("2", "SERVICE FINGERPRINT", "Identify services", Colors.CYAN),
+    ("3", "SUBDOMAIN ENUMERATION", "Discover subdomains", Colors.CYAN),
+    ("4", "WEB CRAWLER", "Spider websites", Colors.CYAN),
+    ("5", "USERNAME ENUMERATION", "OSINT: Check usernames", Colors.PURPLE),
+    ("6", "DOMAIN INTELLIGENCE", "OSINT: WHOIS & DNS", Colors.PURPLE),
+    ("7", "DDOS ATTACK", "Flood & exhaust server", Colors.RED),
+    ("8", "FULL RECONNAISSANCE", "Run recon modules", Colors.NEON),
+    ("9", "SETTINGS", "Configure parameters", Colors.GRAY),
+    ("0", "EXIT", "Exit program", Colors.RED),
+]
+
+MENU = ''.join([
+    f"\n{PURPLE_RULE}\n",
+    f"{Colors.BOLD}{Colors.PURPLE}                   {Colors.CYAN}◈  OPERATION MENU  ◈{Colors.ENDC}\n",
+    f"{PURPLE_RULE}\n\n",
+    # Compact table layout
+    f"{Colors.CYAN}┌────┬──────────────────────────┬──────────────────────────────┐{Colors.ENDC}\n",
+    f"{Colors.CYAN}│ ID │ MODULE                   │ DESCRIPTION                  │{Colors.ENDC}\n",
+    f"{Colors.CYAN}├────┼──────────────────────────┼──────────────────────────────┤{Colors.ENDC}\n",
+    *(
+        f"{Colors.CYAN}│{Colors.ENDC} {color}{idx:2s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC} {color}{name:24s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC} {Colors.WHITE}{desc:28s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC}\n"
+        for idx, name, desc, color in MENU_ITEMS
+    ),
+    f"{Colors.CYAN}└────┴──────────────────────────┴──────────────────────────────┘{Colors.ENDC}\n",
+    f"\n{PURPLE_RULE}\n",
+])
+
+
+def section_header(title, rule_color=Colors.PURPLE):
+    """Module screen header - the title between two rules, as one string"""
+    rule = f"{rule_color}{HEAVY_RULE}{Colors.ENDC}"
+    return f"\n{rule}\n{title}\n{rule}\n\n"
+
+
+# Result line templates - colors baked in, only the data is filled per line
+FOUND_LINE = f"{Colors.GREEN}[✓]{Colors.ENDC} {Colors.CYAN}{{:<20}}{Colors.ENDC} {Colors.GRAY}{{}}{Colors.ENDC}"
+NOT_FOUND_LINE = f"{Colors.RED}[✗]{Colors.ENDC} {Colors.GRAY}{{}}{Colors.ENDC}"
+SUB_IP_LINE = f"  {Colors.GREEN}[+]{Colors.ENDC} {{}} {{}} -> {{}}"
+SUB_CNAME_LINE = f"  {Colors.GREEN}[+]{Colors.ENDC} {{}} {{}} -> CNAME: {{}}"
+SUB_UNRESOLVED_LINE = f"  {Colors.GRAY}[+]{Colors.ENDC} {{}} {{}} (not resolving)"
+SERVICE_LINE = f"{Colors.GREEN}[+]{Colors.ENDC} Port {{}}: {{}}"
+
+# Domain intel report: section titles and "Label: value" lines
+INTEL_SECTION_LINE = f"{Colors.PURPLE}═══ {{}} ═══{Colors.ENDC}\n"
+INTEL_FIELD_LINE = f"{Colors.CYAN}{{}}:{Colors.ENDC} {{}}"
+
+# (label, key) pairs shown when the key has a value
+WHOIS_FIELDS = (
+    ('Registrar', 'registrar'),
+    ('Created', 'creation_date'),
+    ('Expires', 'expiration_date'),
+    ('Organization', 'org'),
+    ('Country', 'country'),
+    ('Contact Emails', 'emails'),
+)
+IP_FIELDS = (('Country', 'country'), ('City', 'city'), ('ISP', 'isp'))
+DNS_FIELDS = (('A Records', 'A'), ('MX Records', 'MX'), ('Nameservers', 'NS'))
+TECH_FIELDS = (('Technologies', 'technologies'),)
+
+# Module screen headers, rendered once like the menu
+PORT_SCANNER_HEADER = section_header(f"{Colors.BOLD}{Colors.CYAN}◈ PORT SCANNER MODULE{Colors.ENDC}")
+FINGERPRINT_HEADER = section_header(f"{Colors.BOLD}{Colors.CYAN}◈ SERVICE FINGERPRINTING MODULE{Colors.ENDC}")
+SUBDOMAIN_HEADER = section_header(f"{Colors.BOLD}{Colors.CYAN}◈ SUBDOMAIN ENUMERATION MODULE{Colors.ENDC}")
+WEB_CRAWLER_HEADER = section_header(f"{Colors.BOLD}{Colors.CYAN}◈ WEB CRAWLER MODULE{Colors.ENDC}")
+USERNAME_HEADER = section_header(f"{Colors.BOLD}{Colors.PURPLE}◈ USERNAME ENUMERATION MODULE [OSINT]{Colors.ENDC}")
+DOMAIN_INTEL_HEADER = section_header(f"{Colors.BOLD}{Colors.PURPLE}◈ DOMAIN INTELLIGENCE MODULE [OSINT]{Colors.ENDC}")
+DDOS_HEADER = section_header(f"{Colors.BOLD}{Colors.RED}◈◈◈ {Colors.YELLOW}DDoS ATTACK SIMULATOR{Colors.RED} ◈◈◈{Colors.ENDC}", Colors.RED)
+FULL_RECON_HEADER = section_header(f"{Colors.BOLD}{Colors.PURPLE}◈◈◈ {Colors.CYAN}FULL RECONNAISSANCE SUITE {Colors.PURPLE}◈◈◈{Colors.ENDC}")
+
+
+def print_banner():
+    """Display main ASCII banner"""
+    sys.stdout.write(BANNER)
 
 
 def print_menu():
     """Display main menu"""
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.PURPLE}                   {Colors.CYAN}◈  OPERATION MENU  ◈{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
-    
-    # Compact table layout
-    print(f"{Colors.CYAN}┌────┬──────────────────────────┬──────────────────────────────┐{Colors.ENDC}")
-    print(f"{Colors.CYAN}│ ID │ MODULE                   │ DESCRIPTION                  │{Colors.ENDC}")
-    print(f"{Colors.CYAN}├────┼──────────────────────────┼──────────────────────────────┤{Colors.ENDC}")
-    
-    menu_items = [
-        ("1", "PORT SCANNER", "Scan for open ports", Colors.CYAN),
-        ("2", "SERVICE FINGERPRINT", "Identify services", Colors.CYAN),
-        ("3", "SUBDOMAIN ENUMERATION", "Discover subdomains", Colors.CYAN),
-        ("4", "WEB CRAWLER", "Spider websites", Colors.CYAN),
-        ("5", "USERNAME ENUMERATION", "OSINT: Check usernames", Colors.PURPLE),
-        ("6", "DOMAIN INTELLIGENCE", "OSINT: WHOIS & DNS", Colors.PURPLE),
-        ("7", "DDOS ATTACK", "Flood & exhaust server", Colors.RED),
-        ("8", "FULL RECONNAISSANCE", "Run recon modules", Colors.NEON),
-        ("9", "SETTINGS", "Configure parameters", Colors.GRAY),
-        ("0", "EXIT", "Exit program", Colors.RED),
-    ]
-    
-    for idx, name, desc, color in menu_items:
-        print(f"{Colors.CYAN}│{Colors.ENDC} {color}{idx:2s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC} {color}{name:24s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC} {Colors.WHITE}{desc:28s}{Colors.ENDC} {Colors.CYAN}│{Colors.ENDC}")
-    
-    print(f"{Colors.CYAN}└────┴──────────────────────────┴──────────────────────────────┘{Colors.ENDC}")
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-
-
-def get_user_input(prompt, input_type=str, default=None):
+    sys.stdout.write(MENU)
+
+
+# Answers get_user_input takes as yes for a bool prompt
+TRUE_ANSWERS = frozenset({'y', 'yes', 'true', '1'})
+
+
+def get_user_input(prompt, input_type=str, default=None, minimum=None):
     """
     Get validated user input
     
@@ -112,6 +236,7 @@ def get_user_input(prompt, input_type=str, default=None):
         prompt: Prompt message
         input_type: Expected type (str, int, etc.)
         default: Default value if user presses enter
+        minimum: Smallest accepted value for int input
         
     Returns:
         User input of specified type
@@ -125,9 +250,13 @@ def get_user_input(prompt, input_type=str, default=None):
                 return default
             
             if input_type == int:
-                return int(user_input)
+                value = int(user_input)
+                if minimum is not None and value < minimum:
+                    print(f"{Colors.RED}[ERROR]{Colors.ENDC} Value must be at least {minimum}. Please try again.")
+                    continue
+                return value
             elif input_type == bool:
-                return user_input.lower() in ['y', 'yes', 'true', '1']
+                return user_input.lower() in TRUE_ANSWERS
             else:
                 return user_input
                 
@@ -138,6 +267,84 @@ def get_user_input(prompt, input_type=str, default=None):
             return None
 
 
+def emit(lines):
+    """Write a block of output lines with a single write"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def read_key():
+    """Read a single keystroke from the terminal without waiting for Enter"""
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.getch()
+        # Arrow and function keys arrive as two codes - drop the rest too
+        while msvcrt.kbhit():
+            msvcrt.getch()
+        return
+    
+    import termios
+    import tty
+    
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        os.read(fd, 1)
+    finally:
+        # Arrow keys, function keys and pastes are several bytes - throw the
+        # rest away so it doesn't land at the next prompt
+        termios.tcflush(fd, termios.TCIFLUSH)
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+
+def pause():
+    """Wait for a keypress before going back to the menu"""
+    if not sys.stdin.isatty():
+        # Scripted input - consume a line as before
+        input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+        return
+    
+    sys.stdout.write(f"\n{Colors.YELLOW}Press any key to continue...{Colors.ENDC}")
+    sys.stdout.flush()
+    read_key()
+    sys.stdout.write('\n')
+
+
+def field_lines(data, fields):
+    """
+    Render the fields of a result dict that have a value
+    
+    Args:
+        data: Result dict
+        fields: (label, key) pairs, in display order
+        
+    Returns:
+        One "Label: value" line per non-empty field, lists joined with commas
+    """
+    lines = []
+    for label, key in fields:
+        value = data.get(key)
+        if value:
+            if isinstance(value, list):
+                value = ', '.join(value)
+            lines.append(INTEL_FIELD_LINE.format(label, value))
+    return lines
+
+
+def json_default(obj):
+    """Encode values JSON has no type for - sets become lists, anything else its str()"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+@functools.lru_cache(maxsize=16)
+def parse_ports_cached(port_range):
+    """parse_ports, memoized - the same few ranges come up run after run"""
+    return tuple(parse_ports(port_range))
+
+
 def save_results(results, filename=None, module_name=None):
     """
     Save results to JSON file
@@ -155,8 +362,13 @@ def save_results(results, filename=None, module_name=None):
             filename = f"recon_results_{timestamp}.json"
     
     try:
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(results, default=json_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2, default=json_default)
         print(f"{Colors.GREEN}[SUCCESS]{Colors.ENDC} Results saved to {filename}")
     except Exception as e:
         print(f"{Colors.RED}[ERROR]{Colors.ENDC} Failed to save results: {e}")
@@ -165,28 +377,32 @@ def save_results(results, filename=None, module_name=None):
 def module_port_scanner():
     """Port scanner module interface"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}◈ PORT SCANNER MODULE{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(PORT_SCANNER_HEADER)
     
     target = get_user_input("Target IP/Hostname", str)
     if not target:
         return
     
-    port_range = get_user_input("Port range (e.g., 1-1000 or 80,443)", str, "21,22,23,25,53,80,110,143,443,3306,8080")
-    threads = get_user_input("Thread count", int, 50)
+    port_range = get_user_input("Port range (e.g., 1-1000 or 80,443)", str, DEFAULT_SCAN_PORTS)
+    threads = get_user_input("Thread count", int, 50, minimum=1)
+    force = get_user_input("Scan even if the host looks down? (y/n)", bool, False)
     
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting port scan...")
     print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Target: {target}")
     print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Ports: {port_range}")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Parse ports
-    from modules.port_scanner import parse_ports
-    ports = parse_ports(port_range)
+    try:
+        ports = parse_ports_cached(port_range)
+    except ValueError:
+        print(f"{Colors.RED}[ERROR]{Colors.ENDC} Invalid port specification")
+        pause()
+        return
     
     # Run scan
-    results = scan_target(target, ports, threads=threads, timeout=1, verbose=False)
+    results = scan_target(target, ports, threads=threads, timeout=1, verbose=False,
+                          force=force, force_hint="Answer 'y' to the host-up question to scan it anyway")
     
     print(f"\n{Colors.GREEN}[COMPLETE]{Colors.ENDC} Found {len(results)} open ports")
     
@@ -194,112 +410,114 @@ def module_port_scanner():
     if results and get_user_input("Save results to file? (y/n)", bool, False):
         save_results({'scan_type': 'port_scan', 'target': target, 'results': results}, module_name='port_scan')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_service_fingerprint():
     """Service fingerprinting module interface"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}◈ SERVICE FINGERPRINTING MODULE{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(FINGERPRINT_HEADER)
     
     target = get_user_input("Target IP/Hostname", str)
     if not target:
         return
     
-    ports_input = get_user_input("Ports to fingerprint (comma-separated)", str, "80,443,22,21")
+    ports_input = get_user_input("Ports to fingerprint (e.g., 80,443 or 8000-8010)", str, DEFAULT_FINGERPRINT_PORTS)
+    
+    # Parse ports
+    try:
+        ports = parse_ports_cached(ports_input)
+    except ValueError:
+        print(f"{Colors.RED}[ERROR]{Colors.ENDC} Invalid port specification")
+        pause()
+        return
     
     # Resolve target
     ip = resolve_target(target)
     
-    # Parse ports
-    ports = [int(p.strip()) for p in ports_input.split(',')]
-    
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Fingerprinting services on {target} ({ip})...")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Run fingerprinting
     results = fingerprint_target(ip, ports)
     
     # Display results
+    out = []
     for result in results:
-        print(f"{Colors.GREEN}[+]{Colors.ENDC} Port {result['port']}: {result['service']}")
+        out.append(SERVICE_LINE.format(result['port'], result['service']))
         if result['version'] != 'unknown':
-            print(f"    Version: {result['version']}")
+            out.append(f"    Version: {result['version']}")
         if result['details']:
-            print(f"    Details: {result['details'][:80]}...")
-        print()
+            out.append(f"    Details: {result['details'][:80]}...")
+        out.append('')
+    emit(out)
     
     # Ask to save
     if results and get_user_input("Save results to file? (y/n)", bool, False):
         save_results({'scan_type': 'service_fingerprint', 'target': target, 'results': results}, module_name='service_fingerprint')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_subdomain_enum():
     """Subdomain enumeration module interface"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}◈ SUBDOMAIN ENUMERATION MODULE{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(SUBDOMAIN_HEADER)
     
     domain = get_user_input("Target domain (e.g., example.com)", str)
     if not domain:
         return
     
-    threads = get_user_input("Thread count", int, 20)
+    threads = get_user_input("Thread count", int, 20, minimum=1)
     
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Enumerating subdomains for {domain}...")
     print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} This may take a few minutes...")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Run enumeration
     results = enumerate_subdomains(domain, threads=threads)
     
-    # Display results
-    print(f"{Colors.GREEN}[COMPLETE]{Colors.ENDC} Found {results['total_found']} subdomains\n")
+    # Display results - the whole report goes out in one write
+    out = [f"{Colors.GREEN}[COMPLETE]{Colors.ENDC} Found {results['total_found']} subdomains\n"]
     
     if results['zone_transfer']:
-        print(f"{Colors.YELLOW}[ZONE TRANSFER]{Colors.ENDC} Successful! Found {len(results['zone_transfer'])} records")
+        out.append(f"{Colors.YELLOW}[ZONE TRANSFER]{Colors.ENDC} Successful! Found {len(results['zone_transfer'])} records")
     
     if results['cert_transparency']:
-        print(f"{Colors.PURPLE}[CERT TRANSPARENCY]{Colors.ENDC} Found {len(results['cert_transparency'])} from SSL certificates")
+        out.append(f"{Colors.PURPLE}[CERT TRANSPARENCY]{Colors.ENDC} Found {len(results['cert_transparency'])} from SSL certificates")
     
     if results['brute_force']:
-        print(f"\n{Colors.CYAN}Discovered Subdomains:{Colors.ENDC}")
+        out.append(f"\n{Colors.CYAN}Discovered Subdomains:{Colors.ENDC}")
         
-        # Combine all sources for display
-        all_subs = []
-        all_subs.extend(results['brute_force'])
-        all_subs.extend(results.get('cert_transparency', []))
+        # Combine all sources for display, without copying either list
+        all_subs = chain(results['brute_force'], results.get('cert_transparency', []))
+        total_subs = len(results['brute_force']) + len(results.get('cert_transparency', []))
         
-        for item in all_subs[:20]:  # Show first 20
+        for item in islice(all_subs, 20):  # Show first 20
             source_tag = f"[CT]" if item.get('source') == 'cert_transparency' else ""
             if 'ips' in item:
-                print(f"  {Colors.GREEN}[+]{Colors.ENDC} {source_tag} {item['subdomain']} -> {', '.join(item['ips'])}")
+                out.append(SUB_IP_LINE.format(source_tag, item['subdomain'], ', '.join(item['ips'])))
             elif 'cnames' in item:
-                print(f"  {Colors.GREEN}[+]{Colors.ENDC} {source_tag} {item['subdomain']} -> CNAME: {', '.join(item['cnames'])}")
+                out.append(SUB_CNAME_LINE.format(source_tag, item['subdomain'], ', '.join(item['cnames'])))
             elif item.get('status') == 'not_resolving':
-                print(f"  {Colors.GRAY}[+]{Colors.ENDC} {source_tag} {item['subdomain']} (not resolving)")
+                out.append(SUB_UNRESOLVED_LINE.format(source_tag, item['subdomain']))
         
-        if len(all_subs) > 20:
-            print(f"  ... and {len(all_subs) - 20} more")
+        if total_subs > 20:
+            out.append(f"  ... and {total_subs - 20} more")
+    
+    emit(out)
     
     # Ask to save
     if results['total_found'] > 0 and get_user_input("\nSave results to file? (y/n)", bool, False):
         save_results(results, module_name='subdomain_enum')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_web_crawler():
     """Web crawler module interface"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}◈ WEB CRAWLER MODULE{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(WEB_CRAWLER_HEADER)
     
     url = get_user_input("Target URL (e.g., https://example.com)", str)
     if not url:
@@ -310,7 +528,7 @@ def module_web_crawler():
     
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Crawling {url}...")
     print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Max depth: {max_depth}, Max pages: {max_pages}")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Run crawler
     results = crawl_website(url, max_depth=max_depth, max_pages=max_pages)
@@ -325,29 +543,29 @@ def module_web_crawler():
     print(f"  Sitemap: {'Found' if results['sitemap'] else 'Not found'}")
     
     # Show sample results
+    out = []
     if results['forms']:
-        print(f"\n{Colors.CYAN}Forms discovered:{Colors.ENDC}")
+        out.append(f"\n{Colors.CYAN}Forms discovered:{Colors.ENDC}")
         for form in results['forms'][:5]:
-            print(f"  {Colors.GREEN}[+]{Colors.ENDC} {form['method']} {form['action']}")
+            out.append(f"  {Colors.GREEN}[+]{Colors.ENDC} {form['method']} {form['action']}")
     
     if results['emails']:
-        print(f"\n{Colors.CYAN}Emails found:{Colors.ENDC}")
-        for email in list(results['emails'])[:10]:
-            print(f"  {Colors.GREEN}[+]{Colors.ENDC} {email}")
+        out.append(f"\n{Colors.CYAN}Emails found:{Colors.ENDC}")
+        for email in islice(results['emails'], 10):
+            out.append(f"  {Colors.GREEN}[+]{Colors.ENDC} {email}")
+    emit(out)
     
     # Ask to save
     if get_user_input("\nSave results to file? (y/n)", bool, False):
         save_results(results, module_name='web_crawler')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_username_enum():
     """Username enumeration OSINT module"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.PURPLE}◈ USERNAME ENUMERATION MODULE [OSINT]{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(USERNAME_HEADER)
     
     username = get_user_input("Username to check", str)
     if not username:
@@ -355,7 +573,7 @@ def module_username_enum():
     
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Checking username '{username}' across 50+ platforms...")
     print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} This may take a moment...")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Run check
     results = check_username(username)
@@ -367,109 +585,88 @@ def module_username_enum():
     print(f"  {Colors.RED}Not found: {len(results['not_found'])}{Colors.ENDC}")
     print(f"  {Colors.GRAY}Unknown/Error: {len(results['unknown'])}{Colors.ENDC}")
     
+    out = []
+    
     # Show found profiles
     if results['found']:
-        print(f"\n{Colors.PURPLE}═══ FOUND PROFILES ═══{Colors.ENDC}\n")
+        out.append(f"\n{Colors.PURPLE}═══ FOUND PROFILES ═══{Colors.ENDC}\n")
         for item in results['found']:
-            print(f"{Colors.GREEN}[✓]{Colors.ENDC} {Colors.CYAN}{item['platform']:<20}{Colors.ENDC} {Colors.GRAY}{item['url']}{Colors.ENDC}")
+            out.append(FOUND_LINE.format(item['platform'], item['url']))
     
     # Show sample of not found (first 10)
     if results['not_found']:
-        print(f"\n{Colors.GRAY}═══ NOT FOUND (sample) ═══{Colors.ENDC}\n")
+        out.append(f"\n{Colors.GRAY}═══ NOT FOUND (sample) ═══{Colors.ENDC}\n")
         for item in results['not_found'][:10]:
-            print(f"{Colors.RED}[✗]{Colors.ENDC} {Colors.GRAY}{item['platform']}{Colors.ENDC}")
+            out.append(NOT_FOUND_LINE.format(item['platform']))
+    
+    emit(out)
     
     # Ask to save
     if get_user_input("\nSave results to file? (y/n)", bool, False):
         save_results(results, module_name='username_enum')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_domain_intel():
     """Domain intelligence OSINT module"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.PURPLE}◈ DOMAIN INTELLIGENCE MODULE [OSINT]{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(DOMAIN_INTEL_HEADER)
     
     domain = get_user_input("Domain to investigate (e.g., example.com)", str)
     if not domain:
         return
     
     print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Gathering intelligence on '{domain}'...")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    print(f"{CYAN_RULE}\n")
     
     # Run intelligence gathering
     results = domain_intelligence(domain)
     
+    out = []
+    
     # Display WHOIS info
-    print(f"{Colors.PURPLE}═══ WHOIS INFORMATION ═══{Colors.ENDC}\n")
+    out.append(INTEL_SECTION_LINE.format('WHOIS INFORMATION'))
     if 'error' not in results['whois']:
-        whois = results['whois']
-        if whois.get('registrar'):
-            print(f"{Colors.CYAN}Registrar:{Colors.ENDC} {whois['registrar']}")
-        if whois.get('creation_date'):
-            print(f"{Colors.CYAN}Created:{Colors.ENDC} {whois['creation_date']}")
-        if whois.get('expiration_date'):
-            print(f"{Colors.CYAN}Expires:{Colors.ENDC} {whois['expiration_date']}")
-        if whois.get('org'):
-            print(f"{Colors.CYAN}Organization:{Colors.ENDC} {whois['org']}")
-        if whois.get('country'):
-            print(f"{Colors.CYAN}Country:{Colors.ENDC} {whois['country']}")
-        if whois.get('emails'):
-            emails = whois['emails'] if isinstance(whois['emails'], list) else [whois['emails']]
-            print(f"{Colors.CYAN}Contact Emails:{Colors.ENDC} {', '.join(emails)}")
+        out.extend(field_lines(results['whois'], WHOIS_FIELDS))
     else:
-        print(f"{Colors.YELLOW}{results['whois']['error']}{Colors.ENDC}")
+        out.append(f"{Colors.YELLOW}{results['whois']['error']}{Colors.ENDC}")
     
     # Display IP info
-    print(f"\n{Colors.PURPLE}═══ IP & LOCATION ═══{Colors.ENDC}\n")
+    out.append('\n' + INTEL_SECTION_LINE.format('IP & LOCATION'))
     if 'error' not in results['ip_info']:
         ip_info = results['ip_info']
-        print(f"{Colors.CYAN}IP Address:{Colors.ENDC} {ip_info.get('ip', 'N/A')}")
-        if ip_info.get('country'):
-            print(f"{Colors.CYAN}Country:{Colors.ENDC} {ip_info['country']}")
-        if ip_info.get('city'):
-            print(f"{Colors.CYAN}City:{Colors.ENDC} {ip_info['city']}")
-        if ip_info.get('isp'):
-            print(f"{Colors.CYAN}ISP:{Colors.ENDC} {ip_info['isp']}")
+        out.append(INTEL_FIELD_LINE.format('IP Address', ip_info.get('ip', 'N/A')))
+        out.extend(field_lines(ip_info, IP_FIELDS))
     else:
-        print(f"{Colors.YELLOW}{results['ip_info']['error']}{Colors.ENDC}")
+        out.append(f"{Colors.YELLOW}{results['ip_info']['error']}{Colors.ENDC}")
     
     # Display DNS records
-    print(f"\n{Colors.PURPLE}═══ DNS RECORDS ═══{Colors.ENDC}\n")
-    dns = results['dns']
-    if dns.get('A'):
-        print(f"{Colors.CYAN}A Records:{Colors.ENDC} {', '.join(dns['A'])}")
-    if dns.get('MX'):
-        print(f"{Colors.CYAN}MX Records:{Colors.ENDC} {', '.join(dns['MX'])}")
-    if dns.get('NS'):
-        print(f"{Colors.CYAN}Nameservers:{Colors.ENDC} {', '.join(dns['NS'])}")
+    out.append('\n' + INTEL_SECTION_LINE.format('DNS RECORDS'))
+    out.extend(field_lines(results['dns'], DNS_FIELDS))
     
     # Display web technologies
-    print(f"\n{Colors.PURPLE}═══ WEB TECHNOLOGIES ═══{Colors.ENDC}\n")
+    out.append('\n' + INTEL_SECTION_LINE.format('WEB TECHNOLOGIES'))
     if 'error' not in results['web_tech']:
         tech = results['web_tech']
-        print(f"{Colors.CYAN}Server:{Colors.ENDC} {tech.get('server', 'Unknown')}")
-        if tech.get('technologies'):
-            print(f"{Colors.CYAN}Technologies:{Colors.ENDC} {', '.join(tech['technologies'])}")
+        out.append(INTEL_FIELD_LINE.format('Server', tech.get('server', 'Unknown')))
+        out.extend(field_lines(tech, TECH_FIELDS))
     else:
-        print(f"{Colors.YELLOW}{results['web_tech']['error']}{Colors.ENDC}")
+        out.append(f"{Colors.YELLOW}{results['web_tech']['error']}{Colors.ENDC}")
+    
+    emit(out)
     
     # Ask to save
     if get_user_input("\nSave results to file? (y/n)", bool, False):
         save_results(results, module_name='domain_intel')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
 
 
 def module_ddos_attack():
     """DDoS attack simulation module interface"""
     clear_screen()
-    print(f"\n{Colors.RED}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.RED}◈◈◈ {Colors.YELLOW}DDoS ATTACK SIMULATOR{Colors.RED} ◈◈◈{Colors.ENDC}")
-    print(f"{Colors.RED}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(DDOS_HEADER)
     
     # CRITICAL WARNING
     print(f"{Colors.RED}{Colors.BOLD}⚠  CRITICAL WARNING ⚠{Colors.ENDC}")
@@ -480,7 +677,7 @@ def module_ddos_attack():
     
     if confirm != 'YES':
         print(f"{Colors.YELLOW}[ABORT]{Colors.ENDC} Test cancelled. Authorization required.")
-        input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+        pause()
         return
     
     target = get_user_input("Target IP/Hostname", str)
@@ -503,7 +700,7 @@ def module_ddos_attack():
         print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting HTTP Flood...")
         print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Target: {target}:{port}")
         print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Threads: {threads}, Duration: {duration}s")
-        print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+        print(f"{CYAN_RULE}\n")
         
         results = stress_test(target, port, method='http_flood', threads=threads, duration=duration)
     
@@ -514,7 +711,7 @@ def module_ddos_attack():
         print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting Slowloris...")
         print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Target: {target}:{port}")
         print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Sockets: {sockets}, Duration: {duration}s")
-        print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+        print(f"{CYAN_RULE}\n")
         
         results = stress_test(target, port, method='slowloris', sockets=sockets, duration=duration)
     
@@ -525,7 +722,7 @@ def module_ddos_attack():
         
         print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting Combined Attack...")
         print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Target: {target}:{port}")
-        print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+        print(f"{CYAN_RULE}\n")
         
         results = stress_test(target, port, method='combined', 
                             http_threads=http_threads, 
@@ -533,11 +730,11 @@ def module_ddos_attack():
                             duration=duration)
     else:
         print(f"{Colors.RED}[ERROR]{Colors.ENDC} Invalid method selected")
-        input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+        pause()
         return
     
     # Display results
-    print(f"\n{Colors.GREEN}{'='*60}{Colors.ENDC}")
+    print(f"\n{GREEN_RULE}")
     print(f"{Colors.GREEN}[COMPLETE]{Colors.ENDC} Stress test finished\n")
     print(f"  Target: {results['target']}")
     print(f"  Duration: {results['duration']:.2f}s")
@@ -558,76 +755,312 @@ def module_ddos_attack():
     if get_user_input("\nSave results to file? (y/n)", bool, False):
         save_results(results, module_name='ddos_attack')
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    pause()
+
+
+def run_network_scan(target, stop=None):
+    """
+    Scan the first 1000 ports, then fingerprint the open ones
+    
+    The host-up probe is skipped: full recon scans the target regardless,
+    since a host can filter 22/80/443 and still expose other ports.
+    
+    Args:
+        target: Host to scan
+        stop: Optional threading.Event that cuts the scan short
+    
+    Returns:
+        (port scan results, fingerprint results or None if nothing was open)
+    """
+    ports = parse_ports_cached("1-1000")
+    port_results = scan_target(target, ports, threads=100, timeout=1, verbose=False, force=True,
+                               stop=stop)
+    
+    if not port_results or (stop is not None and stop.is_set()):
+        return port_results, None
+    
+    ip = resolve_target(target)
+    open_ports = [p['port'] for p in port_results]
+    return port_results, fingerprint_target(ip, open_ports[:20])  # Limit to first 20
 
 
 def module_full_recon():
     """Run all reconnaissance modules"""
     clear_screen()
-    print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.PURPLE}◈◈◈ {Colors.CYAN}FULL RECONNAISSANCE SUITE {Colors.PURPLE}◈◈◈{Colors.ENDC}")
-    print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
+    sys.stdout.write(FULL_RECON_HEADER)
     
     target = get_user_input("Target (IP/hostname for network scan, domain for DNS)", str)
     if not target:
         return
     
-    print(f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting full reconnaissance on {target}...")
-    print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} This will run all modules sequentially")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
+    full_results = run_full_recon(target)
     
+    # Auto-save full recon results, named after the same moment the results are stamped with
+    started = datetime.fromisoformat(full_results['timestamp'])
+    save_results(full_results, target_filename('full_recon', target, started))
+    
+    pause()
+
+
+def target_filename(module_name, target, when=None):
+    """Auto-generated output filename for one module's results on a target, stamped with when (default: now)"""
+    timestamp = (when or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{module_name}_{target.translate(FILENAME_SAFE)}_{timestamp}.json"
+
+
+# Order of the stages under 'scans' in saved full recon results
+SCAN_ORDER = ('port_scan', 'fingerprinting', 'subdomains', 'web_crawl')
+
+
+def run_full_recon(target):
+    """
+    Run every reconnaissance stage against a target
+    
+    Returns:
+        Combined results, one entry under 'scans' per stage that finished
+    """
     full_results = {
         'target': target,
         'timestamp': datetime.now().isoformat(),
         'scans': {}
     }
     
-    # 1. Port Scan
-    print(f"{Colors.BLUE}[1/4]{Colors.ENDC} Running port scan...")
-    from modules.port_scanner import parse_ports
-    ports = parse_ports("1-1000")
-    port_results = scan_target(target, ports, threads=100, timeout=1, verbose=False)
-    full_results['scans']['port_scan'] = port_results
-    print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Found {len(port_results)} open ports\n")
-    
-    # 2. Service Fingerprinting
-    if port_results:
-        print(f"{Colors.BLUE}[2/4]{Colors.ENDC} Fingerprinting services...")
-        ip = resolve_target(target)
-        open_ports = [p['port'] for p in port_results]
-        fp_results = fingerprint_target(ip, open_ports[:20])  # Limit to first 20
-        full_results['scans']['fingerprinting'] = fp_results
-        print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Identified {len(fp_results)} services\n")
-    
-    # 3. Subdomain Enumeration
-    print(f"{Colors.BLUE}[3/4]{Colors.ENDC} Enumerating subdomains...")
+    # The network chain (scan, then fingerprint what answered), subdomain
+    # enumeration and the crawl share no data, so all three run side by side
+    emit([
+        f"\n{Colors.YELLOW}[INFO]{Colors.ENDC} Starting full reconnaissance on {target}...",
+        f"{Colors.YELLOW}[INFO]{Colors.ENDC} This will run all modules in parallel",
+        f"{CYAN_RULE}\n",
+        f"{Colors.BLUE}[1/4]{Colors.ENDC} Running port scan...",
+        f"{Colors.BLUE}[2/4]{Colors.ENDC} Fingerprinting services (once the scan finishes)...",
+        f"{Colors.BLUE}[3/4]{Colors.ENDC} Enumerating subdomains...",
+        f"{Colors.BLUE}[4/4]{Colors.ENDC} Crawling web presence...\n",
+    ])
+    
+    scans = {}
+    
+    # Set on Ctrl-C so every stage winds down instead of running to the end
+    stop = threading.Event()
+    
+    # Not a with-block: leaving one waits for every stage to finish, which
+    # is exactly what an interrupted run must not do
+    executor = ThreadPoolExecutor(max_workers=3)
+    stages = {
+        executor.submit(run_network_scan, target, stop): 'network',
+        executor.submit(enumerate_subdomains, target, threads=30, stop=stop): 'subdomains',
+        executor.submit(crawl_website, f"http://{target}", max_depth=2, max_pages=30, stop=stop): 'web_crawl',
+    }
+    
     try:
-        subdomain_results = enumerate_subdomains(target, threads=30)
-        full_results['scans']['subdomains'] = subdomain_results
-        print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Found {subdomain_results['total_found']} subdomains\n")
-    except:
-        print(f"{Colors.YELLOW}[SKIP]{Colors.ENDC} Subdomain enumeration failed\n")
-    
-    # 4. Web Crawl
-    print(f"{Colors.BLUE}[4/4]{Colors.ENDC} Crawling web presence...")
+        # Report each stage the moment it finishes, whichever comes first
+        for future in as_completed(stages):
+            stage = stages[future]
+            
+            if stage == 'network':
+                # 1-2. Port Scan and Service Fingerprinting
+                port_results, fp_results = future.result()
+                scans['port_scan'] = port_results
+                done = [f"{Colors.GREEN}[DONE]{Colors.ENDC} Found {len(port_results)} open ports\n"]
+                
+                if fp_results is not None:
+                    scans['fingerprinting'] = fp_results
+                    done.append(f"{Colors.GREEN}[DONE]{Colors.ENDC} Identified {len(fp_results)} services\n")
+                
+                emit(done)
+            
+            elif stage == 'subdomains':
+                # 3. Subdomain Enumeration
+                try:
+                    subdomain_results = future.result()
+                    scans['subdomains'] = subdomain_results
+                    print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Found {subdomain_results['total_found']} subdomains\n")
+                except Exception as e:
+                    print(f"{Colors.YELLOW}[SKIP]{Colors.ENDC} Subdomain enumeration failed: {e}\n")
+            
+            else:
+                # 4. Web Crawl
+                try:
+                    crawl_results = future.result()
+                    scans['web_crawl'] = crawl_results
+                    print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Crawled {len(crawl_results['pages'])} pages\n")
+                except Exception as e:
+                    print(f"{Colors.YELLOW}[SKIP]{Colors.ENDC} Web crawling failed: {e}\n")
+    
+    except BaseException:
+        # Ctrl-C (or a stage bailing out): stop the rest and return right
+        # away. Futures are cancelled one by one - shutdown(cancel_futures=)
+        # needs Python 3.9
+        stop.set()
+        for future in stages:
+            future.cancel()
+        executor.shutdown(wait=False)
+        raise
+    
+    executor.shutdown()
+    
+    # Save the stages in pipeline order, not in the order they finished
+    full_results['scans'] = {name: scans[name] for name in SCAN_ORDER if name in scans}
+    
+    emit([
+        CYAN_RULE,
+        f"{Colors.GREEN}[COMPLETE]{Colors.ENDC} Full reconnaissance finished",
+        f"{CYAN_RULE}\n",
+    ])
+    
+    return full_results
+
+
+def batch_port_scan(target, args):
+    """Batch mode port scan"""
+    ports = parse_ports_cached(args.ports or DEFAULT_SCAN_PORTS)
+    results = scan_target(target, ports, threads=args.threads or 50, timeout=1, verbose=False,
+                          force=args.force)
+    return {'scan_type': 'port_scan', 'target': target, 'results': results}
+
+
+def batch_service_fingerprint(target, args):
+    """Batch mode service fingerprinting"""
+    ports = parse_ports_cached(args.ports or DEFAULT_FINGERPRINT_PORTS)
+    results = fingerprint_target(resolve_target(target), ports)
+    return {'scan_type': 'service_fingerprint', 'target': target, 'results': results}
+
+
+def batch_web_crawler(target, args):
+    """Batch mode web crawl - bare hostnames are crawled over http://"""
+    url = target if '://' in target else f"http://{target}"
+    return crawl_website(url)
+
+
+# --module name -> (output file prefix, runner taking (target, args))
+BATCH_MODULES = {
+    'port': ('port_scan', batch_port_scan),
+    'fp': ('service_fingerprint', batch_service_fingerprint),
+    'sub': ('subdomain_enum', lambda target, args: enumerate_subdomains(target, threads=args.threads or 20)),
+    'crawl': ('web_crawler', batch_web_crawler),
+    'user': ('username_enum', lambda target, args: check_username(target, threads=args.threads or 20)),
+    'intel': ('domain_intel', lambda target, args: domain_intelligence(target)),
+    'full': ('full_recon', lambda target, args: run_full_recon(target)),
+}
+
+
+# Modules whose target must resolve - resolve_target() exits the process otherwise
+RESOLVING_MODULES = {'port', 'fp', 'full'}
+
+
+def positive_int(value):
+    """argparse type for counts that must be 1 or more"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def port_spec(value):
+    """argparse type that checks a port specification up front"""
     try:
-        url = f"http://{target}"
-        crawl_results = crawl_website(url, max_depth=2, max_pages=30)
-        full_results['scans']['web_crawl'] = crawl_results
-        print(f"{Colors.GREEN}[DONE]{Colors.ENDC} Crawled {len(crawl_results['pages'])} pages\n")
-    except:
-        print(f"{Colors.YELLOW}[SKIP]{Colors.ENDC} Web crawling failed\n")
-    
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.GREEN}[COMPLETE]{Colors.ENDC} Full reconnaissance finished")
-    print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
-    
-    # Auto-save full recon results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"full_recon_{target.replace('.', '_')}_{timestamp}.json"
-    save_results(full_results, filename)
+        parse_ports_cached(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid port specification {value!r}")
+    return value
+
+
+def build_parser():
+    """Command-line options for batch mode"""
+    parser = argparse.ArgumentParser(
+        description="PHANTOM - run a module without the interactive menu",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                                      # Interactive menu
+  %(prog)s -m port -t 192.168.1.1 -p 1-1000     # Port scan
+  %(prog)s -m sub -t example.com a.example.org  # Several targets, one process
+  %(prog)s -m full -t example.com -o out.json   # Full recon to a chosen file
+        """
+    )
+    
+    parser.add_argument('-m', '--module', required=True, choices=BATCH_MODULES,
+                        help='Module to run')
+    parser.add_argument('-t', '--target', required=True, nargs='+',
+                        help='Target(s): host, domain, URL or username depending on the module')
+    parser.add_argument('-p', '--ports', type=port_spec, help='Ports for port/fp (e.g. 1-1000 or 80,443)')
+    parser.add_argument('-T', '--threads', type=positive_int, help='Thread count (default: per module)')
+    parser.add_argument('-o', '--output', help='Output JSON file (single target only)')
+    parser.add_argument('--force', action='store_true',
+                        help='Port scan even if the host does not answer on 22/80/443')
+    parser.add_argument('--no-color', action='store_true',
+                        help='Plain output without ANSI colors (also works for the menu)')
+    
+    return parser
+
+
+def run_batch(argv):
+    """
+    Run one module against each target and save each result, no menu or prompts
     
-    input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+    Args:
+        argv: Command-line arguments (without the program name)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.output and len(args.target) > 1:
+        parser.error("--output needs a single target")
+    
+    module_name, runner = BATCH_MODULES[args.module]
+    
+    for target in args.target:
+        # One bad host shouldn't end the whole batch
+        if args.module in RESOLVING_MODULES:
+            try:
+                resolve_address(target)
+            except OSError:
+                print(f"{Colors.RED}[ERROR]{Colors.ENDC} Cannot resolve '{target}' - skipping it")
+                continue
+        
+        results = runner(target, args)
+        
+        # Full recon stamps its own start time - name the file after that same moment
+        started = datetime.fromisoformat(results['timestamp']) if args.module == 'full' else None
+        save_results(results, args.output or target_filename(module_name, target, started))
+
+
+def module_settings():
+    """Settings placeholder"""
+    print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Settings module coming soon...")
+    pause()
+
+
+def shutdown():
+    """Say goodbye and exit"""
+    print(f"\n{PURPLE_RULE}")
+    print(f"{Colors.CYAN}[◈]{Colors.ENDC} {Colors.PURPLE}PHANTOM shutting down...{Colors.ENDC}")
+    print(f"{Colors.GRAY}Remember: Stay invisible. Only test authorized systems.{Colors.ENDC}")
+    print(f"{PURPLE_RULE}\n")
+    sys.exit(0)
+
+
+def invalid_option():
+    """Complain about a menu choice that matches nothing"""
+    print(f"{Colors.RED}[!]{Colors.ENDC} Invalid option. Please try again.")
+    pause()
+
+
+# Menu choice -> handler
+MENU_ACTIONS = {
+    '1': module_port_scanner,
+    '2': module_service_fingerprint,
+    '3': module_subdomain_enum,
+    '4': module_web_crawler,
+    '5': module_username_enum,
+    '6': module_domain_intel,
+    '7': module_ddos_attack,
+    '8': module_full_recon,
+    '9': module_settings,
+    '0': shutdown,
+    'exit': shutdown,
+    'quit': shutdown,
+    'q': shutdown,
+}
 
 
 def main():
@@ -638,41 +1071,18 @@ def main():
         print_banner()
         print_menu()
         
-        choice = get_user_input("\nSelect option", str)
+        choice = get_user_input("\nSelect option", str) or ''
         
-        if choice == '1':
-            module_port_scanner()
-        elif choice == '2':
-            module_service_fingerprint()
-        elif choice == '3':
-            module_subdomain_enum()
-        elif choice == '4':
-            module_web_crawler()
-        elif choice == '5':
-            module_username_enum()
-        elif choice == '6':
-            module_domain_intel()
-        elif choice == '7':
-            module_ddos_attack()
-        elif choice == '8':
-            module_full_recon()
-        elif choice == '9':
-            print(f"{Colors.YELLOW}[INFO]{Colors.ENDC} Settings module coming soon...")
-            input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
-        elif choice == '0' or choice.lower() in ['exit', 'quit', 'q']:
-            print(f"\n{Colors.PURPLE}{'═'*68}{Colors.ENDC}")
-            print(f"{Colors.CYAN}[◈]{Colors.ENDC} {Colors.PURPLE}PHANTOM shutting down...{Colors.ENDC}")
-            print(f"{Colors.GRAY}Remember: Stay invisible. Only test authorized systems.{Colors.ENDC}")
-            print(f"{Colors.PURPLE}{'═'*68}{Colors.ENDC}\n")
-            sys.exit(0)
-        else:
-            print(f"{Colors.RED}[!]{Colors.ENDC} Invalid option. Please try again.")
-            input(f"\n{Colors.YELLOW}Press Enter to continue...{Colors.ENDC}")
+        MENU_ACTIONS.get(choice.lower(), invalid_option)()
 
 
 if __name__ == "__main__":
     try:
-        main()
+        # --no-color alone still means the interactive menu
+        if [arg for arg in sys.argv[1:] if arg != '--no-color']:
+            run_batch(sys.argv[1:])
+        else:
+            main()
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}[!]{Colors.ENDC} {Colors.PURPLE}PHANTOM interrupted{Colors.ENDC}")
         print(f"{Colors.GRAY}Vanishing...{Colors.ENDC}\n")